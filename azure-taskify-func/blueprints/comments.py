@@ -0,0 +1,345 @@
+import azure.functions as func
+import logging
+import json
+import uuid
+from datetime import datetime
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from core.async_mode import async_variant
+from core.http import headers, json_response
+from core.listing_cache import invalidate_project
+from core.listings import cached_listing_response, item_response, listing_response, read_listing_params
+from core.tracing import span, traced
+from core.cosmos_clients import (
+    async_query_project_items,
+    bulk_max_items,
+    create_items_bulk,
+    get_async_comments_container,
+    get_comments_container,
+    query_project_items,
+    request_options,
+    reset_async_clients,
+    reset_clients,
+    should_reset_clients
+)
+
+bp = func.Blueprint()
+
+# Campos devolvidos; a query só projeta estes
+COMMENT_FIELDS = ["id", "project_id", "description", "username", "created_at"]
+
+
+def comment_to_result(item: dict) -> dict:
+    return {
+        "id": item.get("id"),
+        "project_id": item.get("project_id"),
+        "description": item.get("description"),
+        "username": item.get("username"),
+        "created_at": item.get("created_at"),
+    }
+
+
+def build_comment(project_id: str, username: str, description: str, created_at: str = None) -> dict:
+    id = str(uuid.uuid4())
+
+    return {
+        "id": id,
+        "project_id": project_id,
+        "username": username,
+        "description": description,
+        "created_at": created_at or datetime.utcnow().isoformat(),
+    }
+
+
+async def add_project_comment_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        body = req.get_json()
+        project_id = req.route_params.get("projectId")
+        description = body.get("description")
+        username = body.get("username")
+
+        if not project_id or not description or not username:
+            return json_response(400, False, "Parâmetros project, username e description são obrigatórios.")
+
+        container = await get_async_comments_container()
+
+        data = build_comment(project_id, username, description)
+
+        with span("cosmos.create"):
+            await container.create_item(body=data, **request_options())
+
+        invalidate_project("comments", project_id)
+
+        return func.HttpResponse(
+            body=json.dumps(data),
+            status_code=201,
+            mimetype="application/json",
+            headers=headers
+        )
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce.message}")
+        return json_response(500, False, f"Erro ao comunicar com a base de dados. \n  {ce}")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao criar comentário: {e}")
+        return json_response(500, False, f"Erro interno ao criar comentário. \n {e}")
+
+
+@bp.route(route="project/{projectId}/comment", methods=["POST"])
+@traced
+@async_variant(add_project_comment_async)
+def add_project_comment(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        body = req.get_json()
+        project_id = req.route_params.get("projectId")
+        description = body.get("description")
+        username = body.get("username")
+
+        if not project_id or not description or not username:
+            return json_response(400, False, "Parâmetros project, username e description são obrigatórios.")
+
+        container = get_comments_container()
+
+        data = build_comment(project_id, username, description)
+
+        with span("cosmos.create"):
+            container.create_item(body=data, **request_options())
+
+        invalidate_project("comments", project_id)
+
+        return  func.HttpResponse(
+                body=json.dumps(data or {}),
+                status_code=201,
+                mimetype="application/json",
+                headers=headers
+            )
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce.message}")
+        return json_response(500, False, f"Erro ao comunicar com a base de dados. \n  {ce}")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao criar comentário: {e}")
+        return json_response(500, False, f"Erro interno ao criar comentário. \n {e}")
+
+
+@bp.route(route="project/{projectId}/comment/bulk", methods=["POST"])
+@traced
+def import_project_comments(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        if not project_id:
+            return json_response(400, False, "O parâmetro projectId é obrigatório.")
+
+        try:
+            body = req.get_json()
+        except ValueError:
+            body = None
+
+        if not isinstance(body, list) or not body:
+            return json_response(400, False, "O corpo do pedido deve ser uma lista de comentários.")
+
+        if len(body) > bulk_max_items:
+            return json_response(400, False, f"Máximo de {bulk_max_items} comentários por pedido.")
+
+        invalid = [
+            index for index, item in enumerate(body)
+            if not isinstance(item, dict) or not item.get("description") or not item.get("username")
+        ]
+        if invalid:
+            return json_response(400, False, "Parâmetros username e description são obrigatórios em todos os comentários.", {"invalid": invalid})
+
+        atomic = req.params.get("atomic", "").lower() == "true"
+
+        # Na importação mantém-se o created_at original, se vier no pedido
+        comments = [
+            build_comment(project_id, item["username"], item["description"], item.get("created_at"))
+            for item in body
+        ]
+
+        results, charge = create_items_bulk(get_comments_container(), project_id, comments, atomic)
+
+        created = sum(1 for result in results if result["success"])
+        if created:
+            invalidate_project("comments", project_id)
+
+        data = {"results": results, "created": created, "failed": len(results) - created, "request_charge": charge}
+        logging.info(f"Importação de comentários no projeto {project_id}: {created}/{len(results)} criados, {charge} RU.")
+
+        if created == len(results):
+            return json_response(201, True, "Comentários importados com sucesso.", data)
+        if created:
+            return json_response(207, False, "Alguns comentários não foram importados.", data)
+        return json_response(500, False, "Nenhum comentário foi importado.", data)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce.message}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao importar comentários: {e}")
+        return json_response(500, False, "Erro interno ao importar comentários.")
+
+
+async def get_all_project_comments_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        params, error = read_listing_params(req, "comments", COMMENT_FIELDS)
+        if error:
+            return error
+
+        project_id = params["project_id"]
+        cached = cached_listing_response(req, params["cache_key"])
+        if cached is not None:
+            return cached
+
+        container = await get_async_comments_container()
+
+        try:
+            items, next_continuation = await async_query_project_items(
+                container,
+                params["query"],
+                project_id,
+                parameters=params["parameters"],
+                limit=int(params["limit"]) if params["limit"] else None,
+                continuation=params["continuation"]
+            )
+        except ValueError:
+            return json_response(400, False, "Parâmetro continuation inválido.")
+
+        return listing_response(
+            req, params["cache_key"], params["cache_variant"], items, lambda: next_continuation, params["since"], comment_to_result
+        )
+
+    except HttpResponseError as ce:
+        if ce.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {ce}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao obter comentários: {e}")
+        return json_response(500, False, "Erro interno ao obter comentários.")
+
+
+# Só GET: na mesma app, a rota também recebe o POST de add_project_comment
+@bp.route(route="project/{projectId}/comment", methods=["GET"])
+@traced
+@async_variant(get_all_project_comments_async)
+def get_all_project_comments(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        params, error = read_listing_params(req, "comments", COMMENT_FIELDS)
+        if error:
+            return error
+
+        project_id = params["project_id"]
+        cached = cached_listing_response(req, params["cache_key"])
+        if cached is not None:
+            return cached
+
+        container = get_comments_container()
+
+        # query_items devolve as páginas à medida que são lidas
+        try:
+            items, next_continuation = query_project_items(
+                container,
+                params["query"],
+                project_id,
+                parameters=params["parameters"],
+                limit=int(params["limit"]) if params["limit"] else None,
+                continuation=params["continuation"]
+            )
+        except ValueError:
+            return json_response(400, False, "Parâmetro continuation inválido.")
+
+        return listing_response(
+            req, params["cache_key"], params["cache_variant"], items, next_continuation, params["since"], comment_to_result
+        )
+
+    except HttpResponseError as ce:
+        if ce.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {ce}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter comentários: {e}")
+        return json_response(500, False, "Erro interno ao obter comentários.")
+
+
+async def get_project_comment_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        item_id = req.route_params.get("commentId")
+        if not project_id or not item_id:
+            return json_response(400, False, "Os parâmetros projectId e commentId são obrigatórios.")
+
+        container = await get_async_comments_container()
+
+        try:
+            with span("cosmos.read"):
+                item = await container.read_item(item=item_id, partition_key=project_id, **request_options())
+        except ResourceNotFoundError:
+            return json_response(404, False, "Comentário não encontrado.")
+
+        return item_response(req, item, comment_to_result)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao obter comentário: {e}")
+        return json_response(500, False, "Erro interno ao obter comentário.")
+
+
+@bp.route(route="project/{projectId}/comment/{commentId}", methods=["GET"])
+@traced
+@async_variant(get_project_comment_async)
+def get_project_comment(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        item_id = req.route_params.get("commentId")
+        if not project_id or not item_id:
+            return json_response(400, False, "Os parâmetros projectId e commentId são obrigatórios.")
+
+        container = get_comments_container()
+
+        # Leitura pontual pela partition key: a operação mais barata do Cosmos
+        try:
+            with span("cosmos.read"):
+                item = container.read_item(item=item_id, partition_key=project_id, **request_options())
+        except ResourceNotFoundError:
+            return json_response(404, False, "Comentário não encontrado.")
+
+        return item_response(req, item, comment_to_result)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter comentário: {e}")
+        return json_response(500, False, "Erro interno ao obter comentário.")
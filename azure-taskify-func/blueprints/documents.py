@@ -0,0 +1,272 @@
+import azure.functions as func
+import logging
+import os
+from azure.core.exceptions import HttpResponseError
+from core import storage
+from core.async_mode import async_variant
+from core.blob_clients import get_async_container_client, get_container_client, reset_async_clients, reset_clients, should_reset_clients
+from core.blob_resolver import resolve_blob_urls
+from core.etag import etag_matches, format_etag, new_validator, not_modified_response, track_items
+from core.http import compact_json_response, headers, json_response, read_json_body
+from core.storage import blob_to_file, folder_to_result, generate_file_sas, is_folder
+from core.tracing import span, traced
+
+bp = func.Blueprint()
+
+max_page_size = 5000  # máximo de resultados por página do list_blobs
+resolve_max_names = int(os.getenv("BLOB_RESOLVE_MAX_NAMES", "1000"))
+
+
+def read_files_params(req: func.HttpRequest) -> tuple:
+    """
+    Lê e valida project_id, limit, continuation e path.
+    Devolve (project_id, limit, continuation, path, resposta de erro ou None).
+
+    path é None na listagem plana; senão é a pasta a listar, relativa ao projeto ("" ou "a/b/").
+    """
+    project_id = req.route_params.get("project_id")
+    limit = req.params.get("limit")
+    continuation = req.params.get("continuation")
+    path = req.params.get("path")
+
+    if not project_id:
+        logging.error("ID do projeto não fornecido na rota.")
+        return project_id, limit, continuation, path, json_response(400, False, "ID do projeto não fornecido na rota.")
+
+    if not storage.is_configured(require_prefix=True):
+        logging.error("Erro de configuração: variáveis de ambiente em falta.")
+        return project_id, limit, continuation, path, json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+    if limit is not None and (not (limit.isascii() and limit.isdecimal()) or not 1 <= int(limit) <= max_page_size):
+        return project_id, limit, continuation, path, json_response(400, False, f"Parâmetro limit inválido. Esperado um valor entre 1 e {max_page_size}.")
+
+    if path is not None:
+        segments = [segment for segment in path.split("/") if segment]
+        if any(segment in (".", "..") for segment in segments):
+            return project_id, limit, continuation, path, json_response(400, False, "Parâmetro path inválido.")
+        path = "/".join(segments) + "/" if segments else ""
+
+    return project_id, limit, continuation, path, None
+
+
+def list_project_blobs(container_client, project_root: str, path: str, results_per_page: int = None):
+    """
+    Listagem plana de todos os blobs do projeto ou, com `path`, só dos filhos diretos dessa pasta.
+    Serve tanto para o ContainerClient síncrono como para o de azure.storage.blob.aio.
+    """
+    # A "/" final separa o projeto p1 de p10
+    if path is None:
+        return container_client.list_blobs(
+            name_starts_with=f"{project_root}/",
+            include=["metadata"],
+            results_per_page=results_per_page
+        )
+
+    # Com delimitador, cada subpasta chega como um único BlobPrefix, seja qual for o seu tamanho
+    return container_client.walk_blobs(
+        name_starts_with=f"{project_root}/{path}",
+        include=["metadata"],
+        delimiter="/",
+        results_per_page=results_per_page
+    )
+
+
+def files_response(
+    req: func.HttpRequest,
+    project_id: str,
+    project_root: str,
+    blobs,
+    limit: str,
+    continuation: str,
+    next_continuation,
+    path: str = None
+) -> func.HttpResponse:
+    """
+    Codifica a lista de ficheiros com URLs assinados e ETag (ou responde 304).
+
+    :param next_continuation: função que devolve o token da página seguinte depois de lidos os blobs.
+    :param path: pasta listada; as subpastas vão para o campo folders da resposta.
+    """
+    digest = new_validator(f"{limit}|{continuation}|{path}")
+    folders = []
+
+    def to_results(items):
+        for item in items:
+            if is_folder(item):
+                folders.append(folder_to_result(item, project_root))
+                yield item, None
+            else:
+                yield item, blob_to_file(item, project_root)
+
+    # O URL assinado entra no validador: quando o SAS em cache é renovado (ou a cache é limpa)
+    # o ETag muda, e um cliente com If-None-Match nunca fica com URLs perto de expirar
+    results = track_items(
+        to_results(blobs),
+        digest,
+        lambda result: f"{result[0].name}|{getattr(result[0], 'etag', '')}|{result[1]['url'] if result[1] else ''}"
+    )
+
+    if req.headers.get("If-None-Match"):
+        # Assinar vem quase sempre da cache de SAS; só a codificação é poupada com o 304
+        results = list(results)
+        etag = format_etag(digest)
+        if etag_matches(req, etag):
+            return not_modified_response(etag, headers)
+
+    files = [file for _, file in results if file is not None]
+
+    if path is None:
+        body = {"id": project_id, "files": files, "continuation": next_continuation()}
+    else:
+        body = {"id": project_id, "path": path, "files": files, "folders": folders, "continuation": next_continuation()}
+
+    response = compact_json_response(body, headers)
+    response.headers["ETag"] = format_etag(digest)
+
+    return response
+
+
+async def get_files_by_project_async(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Pedido recebido para obter ficheiros por project_id.")
+
+    try:
+        project_id, limit, continuation, path, error = read_files_params(req)
+        if error:
+            return error
+
+        container_client = await get_async_container_client(storage.connection_string, storage.container_name)
+
+        if container_client is None:
+            logging.error(f"O container '{storage.container_name}' não existe.")
+            return json_response(404, False, f"O container '{storage.container_name}' não existe.")
+
+        project_root = f"{storage.project_prefix}{project_id}"
+        next_continuation = None
+
+        if limit or continuation:
+            pages = list_project_blobs(
+                container_client, project_root, path, int(limit or max_page_size)
+            ).by_page(continuation_token=continuation)
+            with span("blob.list"):
+                try:
+                    blobs = [blob async for blob in await pages.__anext__()]
+                except StopAsyncIteration:
+                    blobs = []
+            next_continuation = pages.continuation_token
+        else:
+            with span("blob.list"):
+                blobs = [blob async for blob in list_project_blobs(container_client, project_root, path)]
+
+        return files_response(req, project_id, project_root, blobs, limit, continuation, lambda: next_continuation, path)
+
+    except HttpResponseError as e:
+        if e.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {e}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao listar blobs: {e}")
+        return json_response(500, False, "Erro interno ao buscar ficheiros.")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao listar blobs: {e}")
+        return json_response(500, False, "Erro interno ao buscar ficheiros.")
+
+
+@bp.route(route="document/project/{project_id}/", methods=["GET"])
+@traced
+@async_variant(get_files_by_project_async)
+def get_files_by_project(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Pedido recebido para obter ficheiros por project_id.")
+
+    try:
+        project_id, limit, continuation, path, error = read_files_params(req)
+        if error:
+            return error
+
+        container_client = get_container_client(storage.connection_string, storage.container_name)
+
+        if container_client is None:
+            logging.error(f"O container '{storage.container_name}' não existe.")
+            return json_response(404, False, f"O container '{storage.container_name}' não existe.")
+
+        project_root = f"{storage.project_prefix}{project_id}"
+        next_continuation = None
+
+        if limit or continuation:
+            # Só a página pedida é lida e assinada
+            pages = list_project_blobs(
+                container_client, project_root, path, int(limit or max_page_size)
+            ).by_page(continuation_token=continuation)
+            with span("blob.list"):
+                blobs = next(pages, [])
+            next_continuation = pages.continuation_token
+        else:
+            blobs = list_project_blobs(container_client, project_root, path)
+
+        return files_response(req, project_id, project_root, blobs, limit, continuation, lambda: next_continuation, path)
+
+    except HttpResponseError as e:
+        if e.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {e}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao listar blobs: {e}")
+        return json_response(500, False, "Erro interno ao buscar ficheiros.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao listar blobs: {e}")
+        return json_response(500, False, "Erro interno ao buscar ficheiros.")
+
+
+@bp.route(route="document/project/{project_id}/urls/", methods=["POST"])
+@traced
+def resolve_project_file_urls(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Pedido recebido para obter URLs de ficheiros do projeto.")
+
+    try:
+        project_id = req.route_params.get("project_id")
+
+        if not project_id:
+            logging.error("ID do projeto não fornecido na rota.")
+            return json_response(400, False, "ID do projeto não fornecido na rota.")
+
+        if not storage.is_configured(require_prefix=True):
+            logging.error("Erro de configuração: variáveis de ambiente em falta.")
+            return json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+        body = read_json_body(req)
+
+        names = body.get("names") if isinstance(body, dict) else None
+        if not names or not isinstance(names, list) or not all(isinstance(name, str) and name for name in names):
+            return json_response(400, False, "Parâmetro names é obrigatório (lista de nomes de ficheiros).")
+
+        if len(names) > resolve_max_names:
+            return json_response(400, False, f"Máximo de {resolve_max_names} nomes por pedido.")
+
+        container_client = get_container_client(storage.connection_string, storage.container_name)
+
+        if container_client is None:
+            logging.error(f"O container '{storage.container_name}' não existe.")
+            return json_response(404, False, f"O container '{storage.container_name}' não existe.")
+
+        # Os nomes são os devolvidos pela listagem, relativos à pasta do projeto
+        project_root = f"{storage.project_prefix}{project_id}"
+        blob_names = {name: f"{project_root}/{name}" for name in names}
+
+        with span("blob.resolve"):
+            urls = resolve_blob_urls(container_client, list(blob_names.values()), generate_file_sas)
+
+        files = {name: urls[blob_name] for name, blob_name in blob_names.items()}
+        missing = sum(1 for url in files.values() if url is None)
+
+        return json_response(200, True, "URLs dos ficheiros obtidos.", {"files": files, "missing": missing})
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter URLs dos ficheiros: {e}")
+        return json_response(500, False, "Erro interno ao obter URLs dos ficheiros.")
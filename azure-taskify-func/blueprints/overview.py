@@ -0,0 +1,272 @@
+import azure.functions as func
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from blueprints.comments import COMMENT_FIELDS
+from blueprints.tasks import TASK_FIELDS
+from core import storage
+from core.async_mode import async_variant
+from core.blob_clients import (
+    get_async_container_client,
+    get_container_client,
+    reset_async_clients as reset_async_blob_clients,
+    reset_clients as reset_blob_clients,
+    should_reset_clients as should_reset_blob_clients
+)
+from core.http import json_response
+from core.storage import blob_to_file
+from core.tracing import bind, span, traced
+from core.cosmos_clients import (
+    async_query_project_items,
+    build_project_query,
+    get_async_comments_container,
+    get_async_tasks_container,
+    get_comments_container,
+    get_tasks_container,
+    is_configured,
+    query_project_items,
+    reset_async_clients,
+    reset_clients,
+    should_reset_clients,
+    validate_page_params
+)
+
+bp = func.Blueprint()
+
+overview_page_size = int(os.getenv("OVERVIEW_PAGE_SIZE", "50"))
+overview_timeout   = float(os.getenv("OVERVIEW_SOURCE_TIMEOUT_SECONDS", "5"))
+
+
+def load_cosmos_items(container, fields: list, project_id: str, limit: int) -> dict:
+    if not is_configured():
+        raise RuntimeError("Variáveis de ambiente Cosmos DB em falta.")
+
+    query = build_project_query(fields)
+    items, next_continuation = query_project_items(container(), query, project_id, limit=limit)
+    # A página é lida por inteiro nesta thread, para o pedido só esperar pelo resultado
+    return {"items": list(items), "continuation": next_continuation()}
+
+
+def load_tasks(project_id: str, limit: int) -> dict:
+    return load_cosmos_items(get_tasks_container, TASK_FIELDS, project_id, limit)
+
+
+def load_comments(project_id: str, limit: int) -> dict:
+    return load_cosmos_items(get_comments_container, COMMENT_FIELDS, project_id, limit)
+
+
+def load_documents(project_id: str, limit: int) -> dict:
+    if not storage.is_configured(require_prefix=True):
+        raise RuntimeError("Erro de configuração: variável de ambiente em falta.")
+
+    container_client = get_container_client(storage.connection_string, storage.container_name)
+    if container_client is None:
+        raise RuntimeError(f"O container '{storage.container_name}' não existe.")
+
+    project_root = f"{storage.project_prefix}{project_id}"
+    pages = container_client.list_blobs(
+        name_starts_with=f"{project_root}/",
+        include=["metadata"],
+        results_per_page=limit
+    ).by_page()
+    with span("blob.list"):
+        blobs = next(pages, [])
+
+    return {
+        "items": [blob_to_file(blob, project_root) for blob in blobs],
+        "continuation": pages.continuation_token
+    }
+
+
+# Fontes do overview; a chave é o nome do campo na resposta
+SOURCES = {
+    "tasks": load_tasks,
+    "comments": load_comments,
+    "documents": load_documents,
+}
+
+# Mensagens devolvidas em "errors"; o detalhe da exceção fica só nos logs
+SOURCE_ERRORS = {
+    "tasks": "Erro ao obter as tarefas.",
+    "comments": "Erro ao obter os comentários.",
+    "documents": "Erro ao obter os documentos.",
+}
+
+
+async def load_cosmos_items_async(container, fields: list, project_id: str, limit: int) -> dict:
+    if not is_configured():
+        raise RuntimeError("Variáveis de ambiente Cosmos DB em falta.")
+
+    query = build_project_query(fields)
+    items, continuation = await async_query_project_items(await container(), query, project_id, limit=limit)
+    return {"items": items, "continuation": continuation}
+
+
+async def load_tasks_async(project_id: str, limit: int) -> dict:
+    return await load_cosmos_items_async(get_async_tasks_container, TASK_FIELDS, project_id, limit)
+
+
+async def load_comments_async(project_id: str, limit: int) -> dict:
+    return await load_cosmos_items_async(get_async_comments_container, COMMENT_FIELDS, project_id, limit)
+
+
+async def load_documents_async(project_id: str, limit: int) -> dict:
+    if not storage.is_configured(require_prefix=True):
+        raise RuntimeError("Erro de configuração: variável de ambiente em falta.")
+
+    container_client = await get_async_container_client(storage.connection_string, storage.container_name)
+    if container_client is None:
+        raise RuntimeError(f"O container '{storage.container_name}' não existe.")
+
+    project_root = f"{storage.project_prefix}{project_id}"
+    pages = container_client.list_blobs(
+        name_starts_with=f"{project_root}/",
+        include=["metadata"],
+        results_per_page=limit
+    ).by_page()
+    with span("blob.list"):
+        try:
+            blobs = [blob async for blob in await pages.__anext__()]
+        except StopAsyncIteration:
+            blobs = []
+
+    return {
+        "items": [blob_to_file(blob, project_root) for blob in blobs],
+        "continuation": pages.continuation_token
+    }
+
+
+ASYNC_SOURCES = {
+    "tasks": load_tasks_async,
+    "comments": load_comments_async,
+    "documents": load_documents_async,
+}
+
+
+def reset_on_error(error: Exception) -> None:
+    if should_reset_clients(error):
+        reset_clients()
+    if should_reset_blob_clients(error):
+        reset_blob_clients()
+
+
+async def reset_on_error_async(error: Exception) -> None:
+    if should_reset_clients(error):
+        await reset_async_clients()
+    if should_reset_blob_clients(error):
+        await reset_async_blob_clients()
+
+
+def read_overview_params(req: func.HttpRequest) -> tuple:
+    """
+    Lê projectId e limit. Devolve (project_id, limit, resposta de erro ou None).
+    """
+    project_id = req.route_params.get("projectId")
+    if not project_id:
+        return project_id, None, json_response(400, False, "O parâmetro projectId é obrigatório.")
+
+    limit = req.params.get("limit")
+    page_error = validate_page_params(limit, None)
+    if page_error:
+        return project_id, None, json_response(400, False, page_error)
+
+    return project_id, int(limit) if limit else overview_page_size, None
+
+
+def overview_response(data: dict, errors: dict) -> func.HttpResponse:
+    data["errors"] = errors
+
+    if not errors:
+        return json_response(200, True, "Overview do projeto obtido com sucesso.", data)
+    if len(errors) < len(SOURCES):
+        return json_response(207, False, "Overview do projeto obtido parcialmente.", data)
+    return json_response(500, False, "Erro ao obter o overview do projeto.", data)
+
+
+async def get_project_overview_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id, limit, error = read_overview_params(req)
+        if error:
+            return error
+
+        # wait_for cancela a fonte que exceder o tempo, em vez de a deixar a correr
+        results = await asyncio.gather(
+            *(asyncio.wait_for(load(project_id, limit), overview_timeout) for load in ASYNC_SOURCES.values()),
+            return_exceptions=True
+        )
+
+        data = {"id": project_id}
+        errors = {}
+
+        for name, result in zip(ASYNC_SOURCES, results):
+            if isinstance(result, asyncio.TimeoutError):
+                data[name] = None
+                errors[name] = "Tempo limite excedido."
+                logging.warning(f"Overview do projeto {project_id}: {name} excedeu {overview_timeout}s.")
+            elif isinstance(result, Exception):
+                await reset_on_error_async(result)
+                data[name] = None
+                errors[name] = SOURCE_ERRORS[name]
+                logging.error(f"Overview do projeto {project_id}: erro ao obter {name}: {result}")
+            else:
+                data[name] = result
+
+        return overview_response(data, errors)
+
+    except Exception as e:
+        logging.error(f"Erro ao obter overview do projeto: {e}")
+        return json_response(500, False, "Erro interno ao obter overview do projeto.")
+
+
+@bp.route(route="project/{projectId}/overview", methods=["GET"])
+@traced
+@async_variant(get_project_overview_async)
+def get_project_overview(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Devolve tarefas, comentários e documentos do projeto numa só resposta.
+
+    As três fontes são lidas em paralelo, por isso a latência é a da mais lenta.
+    Cada fonte tem até OVERVIEW_SOURCE_TIMEOUT_SECONDS; uma fonte que falhe ou exceda
+    o tempo fica a null e é indicada em "errors", sem impedir as restantes (207).
+    """
+    try:
+        project_id, limit, error = read_overview_params(req)
+        if error:
+            return error
+
+        deadline = time.monotonic() + overview_timeout
+
+        # Um pool por pedido, uma thread por fonte: uma fonte lenta só ocupa as threads
+        # deste pedido e nunca deixa os overviews seguintes à espera numa fila partilhada
+        executor = ThreadPoolExecutor(max_workers=len(SOURCES), thread_name_prefix="overview")
+        data = {"id": project_id}
+        errors = {}
+
+        try:
+            futures = {name: executor.submit(bind(load), project_id, limit) for name, load in SOURCES.items()}
+
+            for name, future in futures.items():
+                try:
+                    # O prazo conta desde o início: fontes já terminadas não esperam nada
+                    data[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+                except TimeoutError:
+                    # O resultado, se chegar, é descartado
+                    data[name] = None
+                    errors[name] = "Tempo limite excedido."
+                    logging.warning(f"Overview do projeto {project_id}: {name} excedeu {overview_timeout}s.")
+                except Exception as e:
+                    reset_on_error(e)
+                    data[name] = None
+                    errors[name] = SOURCE_ERRORS[name]
+                    logging.error(f"Overview do projeto {project_id}: erro ao obter {name}: {e}")
+        finally:
+            # Não espera pela fonte que excedeu o prazo: a sua thread termina quando o SDK responder
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return overview_response(data, errors)
+
+    except Exception as e:
+        logging.error(f"Erro ao obter overview do projeto: {e}")
+        return json_response(500, False, "Erro interno ao obter overview do projeto.")
@@ -0,0 +1,337 @@
+import azure.functions as func
+import logging
+import json
+import uuid
+from datetime import datetime
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from core.async_mode import async_variant
+from core.http import headers, json_response
+from core.listing_cache import invalidate_project
+from core.listings import cached_listing_response, item_response, listing_response, read_listing_params
+from core.tracing import span, traced
+from core.cosmos_clients import (
+    async_query_project_items,
+    bulk_max_items,
+    create_items_bulk,
+    get_async_tasks_container,
+    get_tasks_container,
+    query_project_items,
+    request_options,
+    reset_async_clients,
+    reset_clients,
+    should_reset_clients
+)
+
+bp = func.Blueprint()
+
+# Campos devolvidos; a query só projeta estes
+TASK_FIELDS = ["id", "project_id", "description", "created_at", "status"]
+
+
+def task_to_result(item: dict) -> dict:
+    return {
+        "id": item.get("id"),
+        "project_id": item.get("project_id"),
+        "description": item.get("description"),
+        "created_at": item.get("created_at"),
+        "status": item.get("status")
+    }
+
+
+def build_task(project_id: str, description: str) -> dict:
+    task_id = str(uuid.uuid4())
+    created_at = datetime.utcnow().isoformat()
+
+    return {
+        "id": task_id,
+        "project_id": project_id,  # partition key do container
+        "projectId": project_id,
+        "description": description,
+        "created_at": created_at,
+        "createdAt": created_at,
+        "status": "ToDo"
+    }
+
+
+async def create_project_task_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        body = req.get_json()
+        project_id = req.route_params.get("projectId")
+        description = body.get("description")
+
+        if not project_id or not description:
+            return json_response(400, False, "Parâmetros project e description são obrigatórios.")
+
+        container = await get_async_tasks_container()
+
+        task = build_task(project_id, description)
+
+        with span("cosmos.create"):
+            await container.create_item(body=task, **request_options())
+
+        invalidate_project("tasks", project_id)
+
+        return func.HttpResponse(
+            body=json.dumps(task),
+            status_code=201,
+            mimetype="application/json",
+            headers=headers
+        )
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao criar tarefa: {e}")
+        return json_response(500, False, "Erro interno ao criar tarefa.")
+
+
+@bp.route(route="project/{projectId}/task", methods=["POST"])
+@traced
+@async_variant(create_project_task_async)
+def create_project_task(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        body = req.get_json()
+        project_id = req.route_params.get("projectId")
+        description = body.get("description")
+
+        if not project_id or not description:
+            return json_response(400, False, "Parâmetros project e description são obrigatórios.")
+
+        container = get_tasks_container()
+
+        task = build_task(project_id, description)
+
+        with span("cosmos.create"):
+            container.create_item(body=task, **request_options())
+
+        invalidate_project("tasks", project_id)
+
+        return  func.HttpResponse(
+                body=json.dumps(task or {}),
+                status_code=201,
+                mimetype="application/json",
+                headers=headers
+            )
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao criar tarefa: {e}")
+        return json_response(500, False, "Erro interno ao criar tarefa.")
+
+
+@bp.route(route="project/{projectId}/task/bulk", methods=["POST"])
+@traced
+def create_project_tasks_bulk(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        if not project_id:
+            return json_response(400, False, "O parâmetro projectId é obrigatório.")
+
+        try:
+            body = req.get_json()
+        except ValueError:
+            body = None
+
+        if not isinstance(body, list) or not body:
+            return json_response(400, False, "O corpo do pedido deve ser uma lista de tarefas.")
+
+        if len(body) > bulk_max_items:
+            return json_response(400, False, f"Máximo de {bulk_max_items} tarefas por pedido.")
+
+        invalid = [index for index, item in enumerate(body) if not isinstance(item, dict) or not item.get("description")]
+        if invalid:
+            return json_response(400, False, "Parâmetro description é obrigatório em todas as tarefas.", {"invalid": invalid})
+
+        atomic = req.params.get("atomic", "").lower() == "true"
+        tasks = [build_task(project_id, item["description"]) for item in body]
+
+        results, charge = create_items_bulk(get_tasks_container(), project_id, tasks, atomic)
+
+        created = sum(1 for result in results if result["success"])
+        if created:
+            invalidate_project("tasks", project_id)
+
+        data = {"results": results, "created": created, "failed": len(results) - created, "request_charge": charge}
+        logging.info(f"Bulk de tarefas no projeto {project_id}: {created}/{len(results)} criadas, {charge} RU.")
+
+        if created == len(results):
+            return json_response(201, True, "Tarefas criadas com sucesso.", data)
+        if created:
+            return json_response(207, False, "Algumas tarefas não foram criadas.", data)
+        return json_response(500, False, "Nenhuma tarefa foi criada.", data)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao criar tarefas: {e}")
+        return json_response(500, False, "Erro interno ao criar tarefas.")
+
+
+async def get_project_tasks_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        params, error = read_listing_params(req, "tasks", TASK_FIELDS)
+        if error:
+            return error
+
+        project_id = params["project_id"]
+        cached = cached_listing_response(req, params["cache_key"])
+        if cached is not None:
+            return cached
+
+        container = await get_async_tasks_container()
+
+        try:
+            items, next_continuation = await async_query_project_items(
+                container,
+                params["query"],
+                project_id,
+                parameters=params["parameters"],
+                limit=int(params["limit"]) if params["limit"] else None,
+                continuation=params["continuation"]
+            )
+        except ValueError:
+            return json_response(400, False, "Parâmetro continuation inválido.")
+
+        return listing_response(
+            req, params["cache_key"], params["cache_variant"], items, lambda: next_continuation, params["since"], task_to_result
+        )
+
+    except HttpResponseError as ce:
+        if ce.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {ce}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, f"Erro ao comunicar com a base de dados. \n {ce}")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao obter tarefas: {e}")
+        return json_response(500, False, f"Erro interno ao obter tarefas. \n {e}")
+
+
+@bp.route(route="project/{projectId}/task", methods=["GET"])
+@traced
+@async_variant(get_project_tasks_async)
+def get_project_tasks(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        params, error = read_listing_params(req, "tasks", TASK_FIELDS)
+        if error:
+            return error
+
+        project_id = params["project_id"]
+        cached = cached_listing_response(req, params["cache_key"])
+        if cached is not None:
+            return cached
+
+        container = get_tasks_container()
+
+        # query_items devolve as páginas à medida que são lidas
+        try:
+            items, next_continuation = query_project_items(
+                container,
+                params["query"],
+                project_id,
+                parameters=params["parameters"],
+                limit=int(params["limit"]) if params["limit"] else None,
+                continuation=params["continuation"]
+            )
+        except ValueError:
+            return json_response(400, False, "Parâmetro continuation inválido.")
+
+        return listing_response(
+            req, params["cache_key"], params["cache_variant"], items, next_continuation, params["since"], task_to_result
+        )
+
+    except HttpResponseError as ce:
+        if ce.status_code == 400 and req.params.get("continuation"):
+            logging.error(f"Token de continuação inválido: {ce}")
+            return json_response(400, False, "Parâmetro continuation inválido.")
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, f"Erro ao comunicar com a base de dados. \n {ce}")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter tarefas: {e}")
+        return json_response(500, False, f"Erro interno ao obter tarefas. \n {e}")
+
+
+async def get_project_task_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        item_id = req.route_params.get("taskId")
+        if not project_id or not item_id:
+            return json_response(400, False, "Os parâmetros projectId e taskId são obrigatórios.")
+
+        container = await get_async_tasks_container()
+
+        try:
+            with span("cosmos.read"):
+                item = await container.read_item(item=item_id, partition_key=project_id, **request_options())
+        except ResourceNotFoundError:
+            return json_response(404, False, "Tarefa não encontrada.")
+
+        return item_response(req, item, task_to_result)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            await reset_async_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro ao obter tarefa: {e}")
+        return json_response(500, False, "Erro interno ao obter tarefa.")
+
+
+@bp.route(route="project/{projectId}/task/{taskId}", methods=["GET"])
+@traced
+@async_variant(get_project_task_async)
+def get_project_task(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        project_id = req.route_params.get("projectId")
+        item_id = req.route_params.get("taskId")
+        if not project_id or not item_id:
+            return json_response(400, False, "Os parâmetros projectId e taskId são obrigatórios.")
+
+        container = get_tasks_container()
+
+        # Leitura pontual pela partition key: a operação mais barata do Cosmos
+        try:
+            with span("cosmos.read"):
+                item = container.read_item(item=item_id, partition_key=project_id, **request_options())
+        except ResourceNotFoundError:
+            return json_response(404, False, "Tarefa não encontrada.")
+
+        return item_response(req, item, task_to_result)
+
+    except HttpResponseError as ce:
+        if should_reset_clients(ce):
+            reset_clients()
+        logging.error(f"Erro Cosmos: {ce}")
+        return json_response(500, False, "Erro ao comunicar com a base de dados.")
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter tarefa: {e}")
+        return json_response(500, False, "Erro interno ao obter tarefa.")
@@ -0,0 +1,722 @@
+import azure.functions as func
+import logging
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ResourceNotFoundError
+from core import storage
+from core.async_mode import async_variant
+from core.blob_clients import get_async_container_client, get_container_client, reset_async_clients, reset_clients, should_reset_clients
+from core.block_upload import MB, async_upload_stream_in_blocks, block_size_mb, should_upload_in_blocks, upload_stream_in_blocks
+from core.dedup import content_blob_name, is_sha256, link_existing, upload_deduplicated
+from core.http import json_response, read_json_body
+from core.storage import generate_read_sas, generate_write_sas
+from core.tracing import bind, span, traced
+from core.upload_sessions import MAX_CHUNK_INDEX, commit_session, create_session, get_received_chunks, parse_session, stage_chunk
+
+bp = func.Blueprint()
+
+upload_max_concurrency = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "4"))
+upload_sas_minutes = int(os.getenv("UPLOAD_SAS_MINUTES", "15"))
+
+allowed_ext = [
+    '.jpg', 
+    '.jpeg',
+    '.png', 
+    '.pdf', 
+    '.txt', 
+    '.docx'
+]
+
+
+def validate_file_extensions(files, allowed_extensions: list) -> str:
+    for file in files:
+        _, ext = os.path.splitext(file.filename)
+        if ext.lower() not in allowed_extensions:
+            return f"Extensão '{ext}' não permitida. Esperadas: {', '.join(allowed_extensions)}"
+    return None 
+
+
+def build_blob_name(prefix: str, file_name: str) -> str:
+    # Gerar nome único
+    # unique_id = uuid.uuid4().hex
+    # blob_name = f"{unique_id}{ext}"
+
+    blob_name : str = file_name
+
+    if prefix:
+        prefix = prefix.rstrip("/") + "/"
+        blob_name = f"{storage.project_prefix}{prefix}{blob_name}"
+        blob_name = blob_name.replace(" ", "_").replace(":", "_").replace("\\", "_")
+
+    return blob_name
+
+
+def upload_single_file(container_client, prefix: str, file, mode: str = None) -> dict:
+    """
+    Faz upload de um ficheiro do pedido e devolve o seu resultado.
+    Os erros são devolvidos no resultado em vez de interromper os restantes uploads.
+
+    :param mode: "blocks" força o upload em blocos paralelos, "single" força um único upload;
+                 por omissão, usa blocos acima de UPLOAD_BLOCK_THRESHOLD_MB.
+    """
+    from azure.storage.blob import ContentSettings
+
+    file_name, ext = os.path.splitext(file.filename)
+
+    if ext.lower() not in allowed_ext:
+        logging.error(f"Extensão '{ext}' não permitida.")
+        return {"file_name": file.filename, "success": False, "error": f"Extensão '{ext}' não permitida."}
+
+    blob_name = build_blob_name(prefix, file_name)
+
+    content_type = file.content_type or "application/octet-stream"
+    content_settings = ContentSettings(content_type=content_type)
+
+    try:
+        blob_client = container_client.get_blob_client(blob_name)
+
+        use_blocks = mode == "blocks" or (mode != "single" and should_upload_in_blocks(file.stream))
+
+        with span("blob.upload"):
+            if use_blocks:
+                upload_stream_in_blocks(blob_client, file.stream, content_settings=content_settings)
+            else:
+                blob_client.upload_blob(file.stream, overwrite=True, content_settings=content_settings)
+
+        blob_url = generate_read_sas(blob_name, hours=1)
+    except Exception as e:
+        logging.error(f"Erro durante o upload de {file.filename}: {e}")
+        return {
+            "file_name": file.filename,
+            "blob_name": blob_name,
+            "success": False,
+            "error": "Erro interno ao enviar o ficheiro.",
+            "exception": e
+        }
+
+    logging.info(f"Ficheiro {blob_name} enviado com sucesso para o Azure Blob Storage.")
+    logging.info(f"URL do ficheiro: {blob_url}")
+
+    return {
+        "file_name": file.filename,
+        "blob_name": blob_name,
+        "url": blob_url,
+        "content_type": content_type,
+        "success": True
+    }
+
+
+async def async_upload_single_file(container_client, prefix: str, file, mode: str = None) -> dict:
+    """
+    Versão assíncrona de upload_single_file, para um ContainerClient de azure.storage.blob.aio.
+    """
+    from azure.storage.blob import ContentSettings
+
+    file_name, ext = os.path.splitext(file.filename)
+
+    if ext.lower() not in allowed_ext:
+        logging.error(f"Extensão '{ext}' não permitida.")
+        return {"file_name": file.filename, "success": False, "error": f"Extensão '{ext}' não permitida."}
+
+    blob_name = build_blob_name(prefix, file_name)
+
+    content_type = file.content_type or "application/octet-stream"
+    content_settings = ContentSettings(content_type=content_type)
+
+    try:
+        blob_client = container_client.get_blob_client(blob_name)
+
+        use_blocks = mode == "blocks" or (mode != "single" and should_upload_in_blocks(file.stream))
+
+        with span("blob.upload"):
+            if use_blocks:
+                await async_upload_stream_in_blocks(blob_client, file.stream, content_settings=content_settings)
+            else:
+                await blob_client.upload_blob(file.stream, overwrite=True, content_settings=content_settings)
+
+        blob_url = generate_read_sas(blob_name, hours=1)
+    except Exception as e:
+        logging.error(f"Erro durante o upload de {file.filename}: {e}")
+        return {
+            "file_name": file.filename,
+            "blob_name": blob_name,
+            "success": False,
+            "error": "Erro interno ao enviar o ficheiro.",
+            "exception": e
+        }
+
+    logging.info(f"Ficheiro {blob_name} enviado com sucesso para o Azure Blob Storage.")
+
+    return {
+        "file_name": file.filename,
+        "blob_name": blob_name,
+        "url": blob_url,
+        "content_type": content_type,
+        "success": True
+    }
+
+
+def read_upload_files(req: func.HttpRequest) -> tuple:
+    """
+    Lê e valida o projeto e os ficheiros do pedido de upload.
+    Devolve (project_id, ficheiros, resposta de erro ou None).
+    """
+    project_id = req.route_params.get("id")
+
+    if not project_id:
+        logging.error("ID do projeto não fornecido na rota.")
+        return project_id, None, json_response(400, False, "ID do projeto não fornecido na rota.")
+
+    # Validação de variáveis de ambiente
+    if not storage.is_configured():
+        logging.error("Erro de configuração: variáveis de ambiente em falta.")
+        return project_id, None, json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+    files  = req.files.getlist("files")
+
+    if not files:
+        logging.error("Nenhum ficheiro enviado no corpo da requisição.")
+        return project_id, None, json_response(400, False, "Nenhum ficheiro enviado no corpo da requisição.")
+
+    file_validation_message = validate_file_extensions(files, allowed_ext)
+
+    if file_validation_message:
+        logging.error(file_validation_message)
+        return project_id, None, json_response(400, False, file_validation_message)
+
+    return project_id, files, None
+
+
+def upload_results_response(results: list) -> tuple:
+    """
+    Monta a resposta a partir dos resultados por ficheiro.
+    Devolve (resposta, True se algum erro invalidar os clientes).
+    """
+    failed = [result for result in results if not result["success"]]
+
+    # As exceções ficam fora da resposta; basta uma para invalidar os clientes
+    errors = [result.pop("exception") for result in failed if "exception" in result]
+    reset = any(should_reset_clients(error) for error in errors)
+
+    if not failed:
+        return json_response(200, True, "Upload concluído com sucesso.", {"files": results}), reset
+
+    # Sem exceções, as falhas são todas do pedido (extensão, hash que não coincide)
+    if len(failed) == len(results) and not errors:
+        return json_response(400, False, "Nenhum ficheiro enviado é válido.", {"files": results}), reset
+
+    if len(failed) == len(results):
+        return json_response(500, False, "Erro interno ao enviar os ficheiros.", {"files": results}), reset
+
+    return json_response(207, False, f"{len(failed)} de {len(results)} ficheiros falharam o upload.", {"files": results}), reset
+
+
+async def upload_file_async(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido para upload de ficheiro.")
+
+    try:
+        project_id, files, error = read_upload_files(req)
+        if error:
+            return error
+
+        container_client = await get_async_container_client(storage.connection_string, storage.container_name, create=True)
+
+        mode = req.params.get("mode")
+
+        # Upload concorrente no event loop; gather preserva a ordem dos ficheiros do pedido
+        slots = asyncio.Semaphore(max(1, upload_max_concurrency))
+
+        async def upload(file) -> dict:
+            async with slots:
+                return await async_upload_single_file(container_client, project_id, file, mode)
+
+        results = list(await asyncio.gather(*(upload(file) for file in files)))
+
+        response, reset = upload_results_response(results)
+        if reset:
+            await reset_async_clients()
+        return response
+
+    except Exception as e:
+        if should_reset_clients(e):
+            await reset_async_clients()
+        logging.error(f"Erro durante o upload: {e}")
+        return json_response(500, False, "Erro interno ao enviar o ficheiro.")
+
+
+@bp.route(route="document/project/{id}/upload/", methods=["POST"])
+@traced
+@async_variant(upload_file_async)
+def upload_file(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido para upload de ficheiro.")
+    
+    try:
+        project_id, files, error = read_upload_files(req)
+        if error:
+            return error
+
+        prefix = project_id
+            
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+        
+
+        mode = req.params.get("mode")
+
+        # Upload concorrente; executor.map preserva a ordem dos ficheiros do pedido
+        max_workers = max(1, min(upload_max_concurrency, len(files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                bind(lambda file: upload_single_file(container_client, prefix, file, mode)),
+                files
+            ))
+
+        response, reset = upload_results_response(results)
+        if reset:
+            reset_clients()
+        return response
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro durante o upload: {e}")
+        return json_response(500, False, "Erro interno ao enviar o ficheiro.")
+
+
+def dedup_upload_single_file(container_client, project_id: str, file, digest: str = None) -> dict:
+    """
+    Faz upload de um ficheiro do pedido pelo SHA-256 do conteúdo e devolve o seu resultado.
+    Se o conteúdo já existir no projeto, só é criado o ponteiro com o nome do ficheiro.
+    """
+    from azure.storage.blob import ContentSettings
+
+    file_name, _ = os.path.splitext(file.filename)
+    blob_name = build_blob_name(project_id, file_name)
+    content_type = file.content_type or "application/octet-stream"
+
+    try:
+        result = upload_deduplicated(
+            container_client, blob_name, project_id, file.stream, digest, ContentSettings(content_type=content_type)
+        )
+        blob_url = generate_read_sas(content_blob_name(project_id, result["sha256"]), hours=1)
+    except ValueError as e:
+        logging.error(f"Hash inválido em {file.filename}: {e}")
+        return {"file_name": file.filename, "blob_name": blob_name, "success": False, "error": str(e)}
+    except Exception as e:
+        logging.error(f"Erro durante o upload de {file.filename}: {e}")
+        return {
+            "file_name": file.filename,
+            "blob_name": blob_name,
+            "success": False,
+            "error": "Erro interno ao enviar o ficheiro.",
+            "exception": e
+        }
+
+    logging.info(f"Ficheiro {blob_name} ligado ao conteúdo {result['sha256']} (deduplicado: {result['deduplicated']}).")
+
+    return {
+        "file_name": file.filename,
+        "blob_name": blob_name,
+        "url": blob_url,
+        "content_type": content_type,
+        **result,
+        "success": True
+    }
+
+
+@bp.route(route="document/project/{id}/upload/dedup/", methods=["POST"])
+@traced
+def upload_file_deduplicated(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido para upload de ficheiro com deduplicação.")
+
+    try:
+        project_id, files, error = read_upload_files(req)
+        if error:
+            return error
+
+        # SHA-256 opcionais, pela ordem dos ficheiros; vazio para os que o cliente não calculou
+        digests = [digest.strip().lower() or None for digest in req.form.getlist("sha256")]
+        if digests and len(digests) != len(files):
+            return json_response(400, False, "Indique um sha256 por ficheiro (vazio se desconhecido).")
+        if not all(digest is None or is_sha256(digest) for digest in digests):
+            return json_response(400, False, "Parâmetro sha256 inválido.")
+        digests = digests or [None] * len(files)
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+
+        max_workers = max(1, min(upload_max_concurrency, len(files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                bind(lambda file, digest: dedup_upload_single_file(container_client, project_id, file, digest)),
+                files,
+                digests
+            ))
+
+        response, reset = upload_results_response(results)
+        if reset:
+            reset_clients()
+        return response
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro durante o upload com deduplicação: {e}")
+        return json_response(500, False, "Erro interno ao enviar o ficheiro.")
+
+
+@bp.route(route="document/project/{id}/upload/dedup/check/", methods=["POST"])
+@traced
+def link_deduplicated_files(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Recebe {"files": [{"file_name", "sha256", "content_type"}]} antes do upload. Os ficheiros cujo
+    conteúdo já existe no projeto ficam logo criados; só os restantes precisam de ser enviados.
+    """
+    logging.info("Recebido pedido de verificação de conteúdo deduplicado.")
+
+    try:
+        project_id = req.route_params.get("id")
+
+        if not project_id:
+            logging.error("ID do projeto não fornecido na rota.")
+            return json_response(400, False, "ID do projeto não fornecido na rota.")
+
+        if not storage.is_configured():
+            logging.error("Erro de configuração: variáveis de ambiente em falta.")
+            return json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+        body = read_json_body(req)
+
+        files = body.get("files") if isinstance(body, dict) else None
+        if not files or not isinstance(files, list) or not all(
+            isinstance(file, dict)
+            and isinstance(file.get("file_name"), str) and file["file_name"]
+            and isinstance(file.get("sha256"), str) and is_sha256(file["sha256"].lower())
+            for file in files
+        ):
+            return json_response(400, False, "Parâmetro files é obrigatório e cada ficheiro precisa de file_name e sha256.")
+
+        for file in files:
+            _, ext = os.path.splitext(file["file_name"])
+            if ext.lower() not in allowed_ext:
+                message = f"Extensão '{ext}' não permitida. Esperadas: {', '.join(allowed_ext)}"
+                logging.error(message)
+                return json_response(400, False, message)
+
+        from azure.storage.blob import ContentSettings
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+
+        def check(file: dict) -> dict:
+            name, _ = os.path.splitext(file["file_name"])
+            blob_name = build_blob_name(project_id, name)
+            digest = file["sha256"].lower()
+            content_settings = ContentSettings(content_type=file.get("content_type") or "application/octet-stream")
+
+            size = link_existing(container_client, blob_name, project_id, digest, content_settings)
+            result = {"file_name": file["file_name"], "blob_name": blob_name, "sha256": digest, "deduplicated": size is not None}
+            if size is not None:
+                result.update(size=size, url=generate_read_sas(content_blob_name(project_id, digest), hours=1))
+            return result
+
+        max_workers = max(1, min(upload_max_concurrency, len(files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(bind(check), files))
+
+        missing = sum(1 for result in results if not result["deduplicated"])
+        return json_response(200, True, f"{missing} de {len(results)} ficheiros precisam de ser enviados.", {"files": results, "missing": missing})
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao verificar conteúdo deduplicado: {e}")
+        return json_response(500, False, "Erro interno ao verificar os ficheiros.")
+
+
+def get_project_session(req: func.HttpRequest):
+    """
+    Valida o projeto e a sessão da rota.
+    Devolve (session, None) ou (None, resposta de erro).
+    """
+    project_id = req.route_params.get("id")
+    if not project_id:
+        logging.error("ID do projeto não fornecido na rota.")
+        return None, json_response(400, False, "ID do projeto não fornecido na rota.")
+
+    if not storage.is_configured():
+        logging.error("Erro de configuração: variáveis de ambiente em falta.")
+        return None, json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+    session = parse_session(req.route_params.get("session_id") or "")
+
+    # A sessão só pode escrever dentro da pasta do próprio projeto
+    if not session or not session["blob_name"].startswith(build_blob_name(project_id, "")):
+        logging.error("Sessão de upload inválida.")
+        return None, json_response(404, False, "Sessão de upload inválida.")
+
+    return session, None
+
+
+@bp.route(route="document/project/{id}/upload/session/", methods=["POST"])
+@traced
+def create_upload_session(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido para criar sessão de upload.")
+
+    try:
+        project_id = req.route_params.get("id")
+
+        if not project_id:
+            logging.error("ID do projeto não fornecido na rota.")
+            return json_response(400, False, "ID do projeto não fornecido na rota.")
+
+        if not storage.is_configured():
+            logging.error("Erro de configuração: variáveis de ambiente em falta.")
+            return json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+        body = read_json_body(req)
+
+        file_name = body.get("file_name") if isinstance(body, dict) else None
+        if not file_name or not isinstance(file_name, str):
+            return json_response(400, False, "Parâmetro file_name é obrigatório.")
+
+        name, ext = os.path.splitext(file_name)
+        if ext.lower() not in allowed_ext:
+            logging.error(f"Extensão '{ext}' não permitida.")
+            return json_response(400, False, f"Extensão '{ext}' não permitida. Esperadas: {', '.join(allowed_ext)}")
+
+        get_container_client(storage.connection_string, storage.container_name, create=True)
+
+        blob_name = build_blob_name(project_id, name)
+        content_type = body.get("content_type") or "application/octet-stream"
+
+        return json_response(201, True, "Sessão de upload criada.", {
+            "session_id": create_session(blob_name, content_type),
+            "blob_name": blob_name,
+            "chunk_size": block_size_mb * MB
+        })
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao criar sessão de upload: {e}")
+        return json_response(500, False, "Erro interno ao criar sessão de upload.")
+
+
+@bp.route(route="document/project/{id}/upload/session/{session_id}/chunk/{index}", methods=["PUT"])
+@traced
+def upload_session_chunk(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        session, error = get_project_session(req)
+        if error:
+            return error
+
+        index = req.route_params.get("index", "")
+        if not (index.isascii() and index.isdecimal()) or int(index) > MAX_CHUNK_INDEX:
+            return json_response(400, False, f"Índice de chunk inválido: '{index}'.")
+
+        data = req.get_body()
+        if not data:
+            return json_response(400, False, "Chunk vazio.")
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+        blob_client = container_client.get_blob_client(session["blob_name"])
+
+        with span("blob.stage"):
+            stage_chunk(blob_client, session, int(index), data)
+
+        return json_response(200, True, "Chunk recebido.", {"index": int(index), "size": len(data)})
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao receber chunk: {e}")
+        return json_response(500, False, "Erro interno ao receber o chunk.")
+
+
+@bp.route(route="document/project/{id}/upload/session/{session_id}/", methods=["GET"])
+@traced
+def get_upload_session(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        session, error = get_project_session(req)
+        if error:
+            return error
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+        blob_client = container_client.get_blob_client(session["blob_name"])
+
+        with span("blob.block_list"):
+            received = get_received_chunks(blob_client, session)
+
+        return json_response(200, True, "Estado da sessão de upload.", {
+            "blob_name": session["blob_name"],
+            "received": sorted(received),
+            "received_bytes": sum(received.values())
+        })
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao obter sessão de upload: {e}")
+        return json_response(500, False, "Erro interno ao obter a sessão de upload.")
+
+
+@bp.route(route="document/project/{id}/upload/session/{session_id}/commit/", methods=["POST"])
+@traced
+def commit_upload_session(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        session, error = get_project_session(req)
+        if error:
+            return error
+
+        body = read_json_body(req)
+        if not isinstance(body, dict):
+            return json_response(400, False, "Corpo do pedido inválido. Esperado um objeto JSON.")
+
+        chunk_count = body.get("chunks")
+        if chunk_count is not None and (not isinstance(chunk_count, int) or chunk_count < 1):
+            return json_response(400, False, "Parâmetro chunks inválido.")
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+        blob_client = container_client.get_blob_client(session["blob_name"])
+
+        with span("blob.commit"):
+            missing = commit_session(blob_client, session, chunk_count)
+        if missing:
+            return json_response(409, False, "Faltam chunks para concluir o upload.", {"missing": missing})
+
+        blob_url = generate_read_sas(session["blob_name"], hours=1)
+
+        logging.info(f"Ficheiro {session['blob_name']} enviado com sucesso por sessão de upload.")
+
+        return json_response(200, True, "Upload concluído com sucesso.", {
+            "blob_name": session["blob_name"],
+            "url": blob_url,
+            "content_type": session["content_type"]
+        })
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao concluir sessão de upload: {e}")
+        return json_response(500, False, "Erro interno ao concluir o upload.")
+
+
+@bp.route(route="document/project/{id}/upload/sas/", methods=["POST"])
+@traced
+def create_upload_urls(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido de URLs de upload direto.")
+
+    try:
+        project_id = req.route_params.get("id")
+
+        if not project_id:
+            logging.error("ID do projeto não fornecido na rota.")
+            return json_response(400, False, "ID do projeto não fornecido na rota.")
+
+        if not storage.is_configured():
+            logging.error("Erro de configuração: variáveis de ambiente em falta.")
+            return json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+        body = read_json_body(req)
+
+        files = body.get("files") if isinstance(body, dict) else None
+        if not files or not isinstance(files, list) or not all(isinstance(file, dict) and isinstance(file.get("file_name"), str) and file["file_name"] for file in files):
+            return json_response(400, False, "Parâmetro files é obrigatório e cada ficheiro precisa de file_name.")
+
+        for file in files:
+            _, ext = os.path.splitext(file["file_name"])
+            if ext.lower() not in allowed_ext:
+                message = f"Extensão '{ext}' não permitida. Esperadas: {', '.join(allowed_ext)}"
+                logging.error(message)
+                return json_response(400, False, message)
+
+        get_container_client(storage.connection_string, storage.container_name, create=True)
+
+        results = []
+        for file in files:
+            name, _ = os.path.splitext(file["file_name"])
+            blob_name = build_blob_name(project_id, name)
+            content_type = file.get("content_type") or "application/octet-stream"
+            upload_url, expiry = generate_write_sas(blob_name, upload_sas_minutes)
+
+            results.append({
+                "file_name": file["file_name"],
+                "blob_name": blob_name,
+                "upload_url": upload_url,
+                "method": "PUT",
+                "headers": {
+                    "x-ms-blob-type": "BlockBlob",
+                    "Content-Type": content_type
+                },
+                "expires_at": expiry.isoformat()
+            })
+
+        return json_response(200, True, "URLs de upload gerados.", {"files": results})
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao gerar URLs de upload: {e}")
+        return json_response(500, False, "Erro interno ao gerar URLs de upload.")
+
+
+def confirm_uploaded_blob(container_client, blob_name: str) -> dict:
+    try:
+        with span("blob.properties"):
+            properties = container_client.get_blob_client(blob_name).get_blob_properties()
+    except ResourceNotFoundError:
+        return {"blob_name": blob_name, "success": False, "error": "Ficheiro não encontrado no Blob Storage."}
+
+    return {
+        "blob_name": blob_name,
+        "url": generate_read_sas(blob_name, hours=1),
+        "content_type": properties.content_settings.content_type,
+        "size": properties.size,
+        "success": True
+    }
+
+
+@bp.route(route="document/project/{id}/upload/complete/", methods=["POST"])
+@traced
+def complete_direct_upload(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Recebido pedido de confirmação de upload direto.")
+
+    try:
+        project_id = req.route_params.get("id")
+
+        if not project_id:
+            logging.error("ID do projeto não fornecido na rota.")
+            return json_response(400, False, "ID do projeto não fornecido na rota.")
+
+        if not storage.is_configured():
+            logging.error("Erro de configuração: variáveis de ambiente em falta.")
+            return json_response(500, False, "Erro de configuração: variável de ambiente em falta.")
+
+        body = read_json_body(req)
+
+        blob_names = body.get("blob_names") if isinstance(body, dict) else None
+        if not blob_names or not isinstance(blob_names, list) or not all(isinstance(name, str) for name in blob_names):
+            return json_response(400, False, "Parâmetro blob_names é obrigatório.")
+
+        project_folder = build_blob_name(project_id, "")
+        if not all(name.startswith(project_folder) for name in blob_names):
+            return json_response(400, False, "Só é possível confirmar ficheiros do próprio projeto.")
+
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+
+        max_workers = max(1, min(upload_max_concurrency, len(blob_names)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                bind(lambda blob_name: confirm_uploaded_blob(container_client, blob_name)),
+                blob_names
+            ))
+
+        if not all(result["success"] for result in results):
+            return json_response(404, False, "Alguns ficheiros não foram encontrados.", {"files": results})
+
+        return json_response(200, True, "Upload concluído com sucesso.", {"files": results})
+
+    except Exception as e:
+        if should_reset_clients(e):
+            reset_clients()
+        logging.error(f"Erro ao confirmar upload direto: {e}")
+        return json_response(500, False, "Erro interno ao confirmar o upload.")
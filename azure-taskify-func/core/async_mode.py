@@ -0,0 +1,71 @@
+import asyncio
+import functools
+import logging
+import os
+
+
+# Com FUNCTIONS_ASYNC_HANDLERS=true as rotas com versão assíncrona são registadas com ela
+use_async_handlers = os.getenv("FUNCTIONS_ASYNC_HANDLERS", "false").lower() == "true"
+aio_max_connections = int(os.getenv("AIO_MAX_CONNECTIONS", "100"))
+
+# Sessão aiohttp partilhada pelos clientes assíncronos do worker (ligada ao event loop)
+_session = None
+_session_loop = None
+
+
+def async_variant(async_handler):
+    """
+    Decorador aplicado ao handler síncrono, por baixo de @app.route.
+
+    Com FUNCTIONS_ASYNC_HANDLERS=true regista `async_handler` no seu lugar, com o mesmo nome
+    de função (e por isso a mesma rota e chaves). A escolha é feita ao carregar a app.
+    """
+    def decorator(handler):
+        if not use_async_handlers:
+            return handler
+
+        @functools.wraps(handler)
+        async def wrapper(req):
+            return await async_handler(req)
+
+        return wrapper
+
+    return decorator
+
+
+def get_aio_session():
+    """
+    Devolve a aiohttp.ClientSession do worker, criando-a no event loop atual.
+    Tem de ser chamada dentro de uma corrotina.
+    """
+    global _session, _session_loop
+
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        logging.info("A criar sessão aiohttp partilhada.")
+        _session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=aio_max_connections))
+        _session_loop = loop
+    return _session
+
+
+def get_aio_transport():
+    """
+    Transporte para os clientes aio do Azure SDK sobre a sessão partilhada.
+    Fechar um cliente não fecha a sessão.
+    """
+    from azure.core.pipeline.transport import AioHttpTransport
+
+    return AioHttpTransport(session=get_aio_session(), session_owner=False)
+
+
+async def close_aio_session() -> None:
+    global _session, _session_loop
+
+    session = _session
+    _session = None
+    _session_loop = None
+
+    if session is not None and not session.closed:
+        await session.close()
@@ -0,0 +1,194 @@
+import logging
+import threading
+from typing import TYPE_CHECKING
+from azure.core.exceptions import (
+    ClientAuthenticationError,
+    ResourceExistsError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+    ServiceResponseError
+)
+from core.async_mode import get_aio_session, get_aio_transport
+from core.tracing import span
+
+# azure.storage.blob só é importado quando o primeiro cliente é criado
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobServiceClient, ContainerClient
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient, ContainerClient as AsyncContainerClient
+
+
+# Clientes partilhados durante toda a vida do worker
+_lock = threading.Lock()
+_service_client: "BlobServiceClient" = None
+_service_connection_string: str = None
+_verified_containers = {}
+
+# Versões assíncronas; só são usadas no event loop do worker, por isso dispensam o lock
+_async_service_client: "AsyncBlobServiceClient" = None
+_async_connection_string: str = None
+_async_session = None
+_async_verified_containers = {}
+
+
+def get_blob_service_client(connection_string: str) -> "BlobServiceClient":
+    """
+    Devolve o BlobServiceClient do worker, criando-o apenas na primeira chamada.
+    O pool de ligações HTTP do cliente é reutilizado entre pedidos.
+    """
+    global _service_client, _service_connection_string
+
+    client = _service_client
+    if client is not None and _service_connection_string == connection_string:
+        return client
+
+    with _lock:
+        if _service_client is None or _service_connection_string != connection_string:
+            from azure.storage.blob import BlobServiceClient
+
+            logging.info("A criar BlobServiceClient partilhado.")
+            with span("blob.client"):
+                _service_client = BlobServiceClient.from_connection_string(connection_string)
+            _service_connection_string = connection_string
+            _verified_containers.clear()
+        return _service_client
+
+
+def get_container_client(connection_string: str, container_name: str, create: bool = False) -> "ContainerClient":
+    """
+    Devolve o ContainerClient do container, verificando a sua existência uma única vez por worker.
+
+    :param create: se True, cria o container quando não existe.
+    :return: o ContainerClient, ou None se o container não existir e create=False.
+    """
+    container_client = _verified_containers.get(container_name)
+    if container_client is not None:
+        return container_client
+
+    service_client = get_blob_service_client(connection_string)
+    container_client = service_client.get_container_client(container_name)
+
+    with span("blob.exists"):
+        exists = container_client.exists()
+
+    if not exists:
+        if not create:
+            return None
+        try:
+            container_client.create_container()
+        except ResourceExistsError:
+            # Outro worker criou o container entretanto
+            pass
+
+    _verified_containers[container_name] = container_client
+    return container_client
+
+
+def get_async_blob_service_client(connection_string: str) -> "AsyncBlobServiceClient":
+    """
+    Versão assíncrona de get_blob_service_client, sobre a sessão aiohttp partilhada do worker.
+    """
+    global _async_service_client, _async_connection_string, _async_session
+
+    session = get_aio_session()
+    if _async_service_client is None or _async_session is not session or _async_connection_string != connection_string:
+        from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+        # Sessão nova (primeira chamada ou outro event loop): os clientes antigos deixam de servir
+        logging.info("A criar BlobServiceClient assíncrono partilhado.")
+        with span("blob.client"):
+            _async_service_client = AsyncBlobServiceClient.from_connection_string(
+                connection_string,
+                transport=get_aio_transport()
+            )
+        _async_connection_string = connection_string
+        _async_session = session
+        _async_verified_containers.clear()
+    return _async_service_client
+
+
+async def get_async_container_client(connection_string: str, container_name: str, create: bool = False) -> "AsyncContainerClient":
+    """
+    Versão assíncrona de get_container_client.
+    """
+    service_client = get_async_blob_service_client(connection_string)
+
+    container_client = _async_verified_containers.get(container_name)
+    if container_client is not None:
+        return container_client
+
+    container_client = service_client.get_container_client(container_name)
+
+    with span("blob.exists"):
+        exists = await container_client.exists()
+
+    if not exists:
+        if not create:
+            return None
+        try:
+            await container_client.create_container()
+        except ResourceExistsError:
+            # Outro worker criou o container entretanto
+            pass
+
+    _async_verified_containers[container_name] = container_client
+    return container_client
+
+
+def warm_up(connection_string: str, container_name: str) -> None:
+    """
+    Cria o cliente e verifica o container antes do primeiro pedido.
+    """
+    if not connection_string or not container_name:
+        logging.warning("Variáveis de ambiente do Blob Storage em falta; warm-up ignorado.")
+        return
+    get_container_client(connection_string, container_name)
+
+
+def should_reset_clients(error: Exception) -> bool:
+    """
+    Indica se o erro invalida os clientes em cache (credenciais, ligação
+    ou container removido depois de verificado).
+    """
+    if isinstance(error, (ClientAuthenticationError, ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(error, ResourceNotFoundError):
+        return getattr(error, "error_code", None) == "ContainerNotFound"
+    return False
+
+
+def reset_clients() -> None:
+    """
+    Descarta os clientes em cache; o próximo pedido volta a criá-los.
+    """
+    global _service_client, _service_connection_string
+
+    with _lock:
+        client = _service_client
+        _service_client = None
+        _service_connection_string = None
+        _verified_containers.clear()
+
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar BlobServiceClient: {e}")
+
+
+async def reset_async_clients() -> None:
+    """
+    Descarta os clientes assíncronos em cache. A sessão aiohttp partilhada mantém-se.
+    """
+    global _async_service_client, _async_connection_string, _async_session
+
+    client = _async_service_client
+    _async_service_client = None
+    _async_connection_string = None
+    _async_session = None
+    _async_verified_containers.clear()
+
+    if client is not None:
+        try:
+            await client.close()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar BlobServiceClient assíncrono: {e}")
@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from azure.core.exceptions import ResourceNotFoundError
+
+
+resolve_max_concurrency = int(os.getenv("BLOB_RESOLVE_MAX_CONCURRENCY", "16"))
+# Nomes pedidos por página de listagem lida; abaixo disto uma ronda de HEADs paralelos é mais rápida
+resolve_names_per_page  = int(os.getenv("BLOB_RESOLVE_NAMES_PER_PAGE", "16"))
+resolve_page_size       = 5000  # máximo de resultados por página do list_blobs
+
+
+def group_by_folder(blob_names: List[str]) -> Dict[str, List[str]]:
+    """
+    Agrupa os nomes pela pasta (tudo até à última "/"), sem repetidos e por ordem.
+    """
+    groups = {}
+    for name in set(blob_names):
+        groups.setdefault(name[:name.rfind("/") + 1], []).append(name)
+    return {folder: sorted(names) for folder, names in groups.items()}
+
+
+def scan_folder(container_client, names: List[str], max_pages: int) -> tuple:
+    """
+    Procura os nomes de uma pasta com walk_blobs, lendo no máximo `max_pages` páginas.
+
+    A listagem vem por ordem lexicográfica, por isso a leitura termina assim que passa
+    o último nome pedido. Devolve ({nome encontrado: metadata}, nomes que ficaram por verificar).
+    """
+    wanted = set(names)
+    last_name = names[-1]
+    listed_up_to = None
+    found = {}
+
+    # Só os filhos diretos da pasta: as subpastas chegam como um único prefixo
+    pages = container_client.walk_blobs(
+        name_starts_with=os.path.commonprefix(names),
+        include=["metadata"],
+        delimiter="/",
+        results_per_page=resolve_page_size
+    ).by_page()
+
+    for read, page in enumerate(pages, start=1):
+        for item in page:
+            if item.name in wanted:
+                found[item.name] = getattr(item, "metadata", None) or {}
+            listed_up_to = item.name
+        if listed_up_to is not None and listed_up_to >= last_name:
+            break
+        if read >= max_pages:
+            return found, [name for name in names if listed_up_to is None or name > listed_up_to]
+
+    return found, []
+
+
+def existing_blobs(container_client, blob_names: List[str], max_concurrency: int = resolve_max_concurrency) -> Dict[str, dict]:
+    """
+    Devolve {nome: metadata} dos nomes que existem no container.
+
+    Pastas com pelo menos BLOB_RESOLVE_NAMES_PER_PAGE nomes pedidos são resolvidas com uma
+    listagem; os restantes nomes com HEADs em paralelo (no máximo `max_concurrency`).
+    """
+    if not blob_names:
+        return {}
+
+    def head(name: str) -> dict:
+        try:
+            return container_client.get_blob_client(name).get_blob_properties().metadata or {}
+        except ResourceNotFoundError:
+            return None
+
+    found = {}
+    max_workers = max(1, min(max_concurrency, len(blob_names)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scans = []
+        heads = []
+        for names in group_by_folder(blob_names).values():
+            max_pages = len(names) // resolve_names_per_page
+            if max_pages:
+                scans.append(executor.submit(scan_folder, container_client, names, max_pages))
+            else:
+                heads.extend((name, executor.submit(head, name)) for name in names)
+
+        for scan in scans:
+            listed, pending = scan.result()
+            found.update(listed)
+            # A pasta tinha mais blobs do que compensava listar: o resto vai por HEAD
+            heads.extend((name, executor.submit(head, name)) for name in pending)
+
+        for name, future in heads:
+            metadata = future.result()
+            if metadata is not None:
+                found[name] = metadata
+
+    return found
+
+
+def resolve_blob_urls(
+    container_client,
+    blob_names: List[str],
+    sign: Callable[[str, dict], str],
+    max_concurrency: int = resolve_max_concurrency
+) -> Dict[str, Optional[str]]:
+    """
+    Devolve {nome: URL com SAS, ou None se o blob não existir} para todos os nomes pedidos.
+
+    :param sign: gera o URL com SAS de um blob a partir do nome e da metadata.
+    """
+    existing = existing_blobs(container_client, blob_names, max_concurrency)
+    return {name: sign(name, existing[name]) if name in existing else None for name in blob_names}
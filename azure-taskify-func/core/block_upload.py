@@ -0,0 +1,187 @@
+import asyncio
+import base64
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+from azure.core import MatchConditions
+
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobClient, ContentSettings
+
+
+block_size_mb        = int(os.getenv("UPLOAD_BLOCK_SIZE_MB", "8"))
+block_concurrency    = int(os.getenv("UPLOAD_BLOCK_CONCURRENCY", "4"))
+block_threshold_mb   = int(os.getenv("UPLOAD_BLOCK_THRESHOLD_MB", "32"))
+
+MB = 1024 * 1024
+
+
+def make_block_id(index: int, nonce: str = "") -> str:
+    """
+    Gera o block id do bloco `index`. Todos os ids de um blob têm o mesmo comprimento,
+    como o Blob Storage exige.
+    """
+    return base64.b64encode(f"{nonce}{index:08d}".encode()).decode()
+
+
+def get_stream_size(stream) -> int:
+    """
+    Devolve o tamanho do stream, ou None se não for possível fazer seek.
+    """
+    try:
+        position = stream.tell()
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+        return size - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def should_upload_in_blocks(stream) -> bool:
+    size = get_stream_size(stream)
+    return size is not None and size > block_threshold_mb * MB
+
+
+def upload_stream_in_blocks(
+    blob_client: "BlobClient",
+    stream,
+    block_size: int = None,
+    max_concurrency: int = None,
+    content_settings: "ContentSettings" = None,
+    metadata: dict = None,
+    overwrite: bool = True,
+    before_commit: Callable[[], None] = None
+) -> dict:
+    """
+    Faz upload de um stream em blocos enviados em paralelo e confirmados com commit_block_list.
+
+    O stream é lido sequencialmente e só são lidos novos blocos quando há uma vaga livre,
+    por isso a memória usada fica limitada a cerca de max_concurrency × block_size,
+    seja qual for o tamanho do ficheiro.
+
+    :param overwrite: se False, o commit falha com ResourceExistsError se o blob já existir.
+    :param before_commit: chamada depois de enviados todos os blocos; se lançar uma exceção,
+                          o blob não é confirmado.
+    :return: as propriedades devolvidas pelo commit_block_list.
+    """
+    from azure.storage.blob import BlobBlock
+
+    block_size = block_size or block_size_mb * MB
+    max_concurrency = max(1, max_concurrency or block_concurrency)
+
+    # O nonce separa os blocos deste upload de outros uploads pendentes para o mesmo blob
+    nonce = uuid.uuid4().hex[:8]
+    slots = threading.BoundedSemaphore(max_concurrency)
+    errors = []
+    block_ids = []
+    futures = []
+
+    def stage(block_id: str, chunk: bytes) -> None:
+        try:
+            blob_client.stage_block(block_id, chunk, length=len(chunk))
+        except Exception as e:
+            errors.append(e)
+            raise
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while not errors:
+            slots.acquire()
+            chunk = stream.read(block_size)
+            if not chunk:
+                slots.release()
+                break
+
+            block_id = make_block_id(len(block_ids), nonce)
+            block_ids.append(block_id)
+            futures.append(executor.submit(stage, block_id, chunk))
+            chunk = None
+
+    # Propaga o primeiro erro; os blocos não confirmados são descartados pelo serviço
+    for future in futures:
+        future.result()
+
+    if before_commit is not None:
+        before_commit()
+
+    logging.info(f"{len(block_ids)} blocos enviados para {blob_client.blob_name}; a confirmar block list.")
+
+    commit_kwargs = {}
+    if not overwrite:
+        commit_kwargs = {"etag": "*", "match_condition": MatchConditions.IfMissing}
+
+    return blob_client.commit_block_list(
+        [BlobBlock(block_id=block_id) for block_id in block_ids],
+        content_settings=content_settings,
+        metadata=metadata,
+        **commit_kwargs
+    )
+
+
+async def async_upload_stream_in_blocks(
+    blob_client,
+    stream,
+    block_size: int = None,
+    max_concurrency: int = None,
+    content_settings: "ContentSettings" = None,
+    metadata: dict = None,
+    overwrite: bool = True
+) -> dict:
+    """
+    Versão assíncrona de upload_stream_in_blocks, para um BlobClient de azure.storage.blob.aio.
+    Os blocos são enviados no event loop, com o mesmo limite de max_concurrency blocos em memória.
+    """
+    from azure.storage.blob import BlobBlock
+
+    block_size = block_size or block_size_mb * MB
+    max_concurrency = max(1, max_concurrency or block_concurrency)
+
+    nonce = uuid.uuid4().hex[:8]
+    slots = asyncio.BoundedSemaphore(max_concurrency)
+    errors = []
+    block_ids = []
+    tasks = []
+
+    async def stage(block_id: str, chunk: bytes) -> None:
+        try:
+            await blob_client.stage_block(block_id, chunk, length=len(chunk))
+        except Exception as e:
+            errors.append(e)
+            raise
+        finally:
+            slots.release()
+
+    while not errors:
+        await slots.acquire()
+        chunk = stream.read(block_size)
+        if not chunk:
+            slots.release()
+            break
+
+        block_id = make_block_id(len(block_ids), nonce)
+        block_ids.append(block_id)
+        tasks.append(asyncio.create_task(stage(block_id, chunk)))
+        chunk = None
+
+    # Propaga o primeiro erro depois de todos os envios terminarem
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+    logging.info(f"{len(block_ids)} blocos enviados para {blob_client.blob_name}; a confirmar block list.")
+
+    commit_kwargs = {}
+    if not overwrite:
+        commit_kwargs = {"etag": "*", "match_condition": MatchConditions.IfMissing}
+
+    return await blob_client.commit_block_list(
+        [BlobBlock(block_id=block_id) for block_id in block_ids],
+        content_settings=content_settings,
+        metadata=metadata,
+        **commit_kwargs
+    )
@@ -0,0 +1,429 @@
+import base64
+import binascii
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from core.async_mode import get_aio_session, get_aio_transport
+from core.tracing import add_metric, bind, cosmos_response_hook, span
+
+# azure.cosmos só é importado quando o primeiro cliente é criado
+if TYPE_CHECKING:
+    from azure.cosmos import ContainerProxy, CosmosClient
+    from azure.cosmos.aio import ContainerProxy as AsyncContainerProxy, CosmosClient as AsyncCosmosClient
+
+
+# CosmosDB config from environment
+COSMOS_URL      = os.getenv("COSMOS_URL")
+COSMOS_KEY      = os.getenv("COSMOS_KEY")
+COSMOS_DATABASE = os.getenv("DATABASE_NAME")
+
+TASKS_CONTAINER    = "ProjectTasks"
+COMMENTS_CONTAINER = "ProjectComments"
+PARTITION_KEY_PATH = "/project_id"
+MAX_PAGE_SIZE      = 1000
+BATCH_SIZE         = 100  # máximo de operações numa transactional batch
+
+bulk_max_items       = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+bulk_max_concurrency = int(os.getenv("BULK_MAX_CONCURRENCY", "8"))
+
+# Cliente e containers partilhados durante toda a vida do worker
+_lock = threading.Lock()
+_client: "CosmosClient" = None
+_containers = {}
+
+# Versões assíncronas; só são usadas no event loop do worker, por isso dispensam o lock
+_async_client: "AsyncCosmosClient" = None
+_async_session = None
+_async_containers = {}
+
+
+def is_configured() -> bool:
+    return all([COSMOS_URL, COSMOS_KEY, COSMOS_DATABASE])
+
+
+def get_cosmos_client() -> "CosmosClient":
+    """
+    Devolve o CosmosClient do worker, criando-o apenas na primeira chamada.
+    """
+    global _client
+
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from azure.cosmos import CosmosClient
+
+                logging.info("A criar CosmosClient partilhado.")
+                with span("cosmos.client"):
+                    _client = CosmosClient(COSMOS_URL, credential=COSMOS_KEY)
+    return _client
+
+
+def _provision() -> None:
+    """
+    Cria a base de dados e os containers ProjectTasks e ProjectComments se não existirem.
+    Chamado uma única vez por worker, com o lock adquirido.
+    """
+    from azure.cosmos import PartitionKey
+
+    db = get_cosmos_client().create_database_if_not_exists(id=COSMOS_DATABASE)
+
+    for name in (TASKS_CONTAINER, COMMENTS_CONTAINER):
+        _containers[name] = db.create_container_if_not_exists(
+            id=name,
+            partition_key=PartitionKey(path=PARTITION_KEY_PATH)
+        )
+
+
+def get_container(name: str) -> "ContainerProxy":
+    """
+    Devolve o ContainerProxy já provisionado; a primeira chamada no worker faz o provisionamento.
+    """
+    container = _containers.get(name)
+    if container is not None:
+        return container
+
+    with _lock:
+        if name not in _containers:
+            with span("cosmos.provision"):
+                _provision()
+        return _containers[name]
+
+
+def get_tasks_container() -> "ContainerProxy":
+    return get_container(TASKS_CONTAINER)
+
+
+def get_comments_container() -> "ContainerProxy":
+    return get_container(COMMENTS_CONTAINER)
+
+
+async def get_async_container(name: str) -> "AsyncContainerProxy":
+    """
+    Versão assíncrona de get_container, sobre a sessão aiohttp partilhada do worker.
+    """
+    global _async_client, _async_session
+
+    from azure.cosmos import PartitionKey
+    from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
+
+    session = get_aio_session()
+    if _async_client is None or _async_session is not session:
+        # Sessão nova (primeira chamada ou outro event loop): os clientes antigos deixam de servir
+        logging.info("A criar CosmosClient assíncrono partilhado.")
+        with span("cosmos.client"):
+            _async_client = AsyncCosmosClient(COSMOS_URL, credential=COSMOS_KEY, transport=get_aio_transport())
+        _async_session = session
+        _async_containers.clear()
+
+    container = _async_containers.get(name)
+    if container is None:
+        with span("cosmos.provision"):
+            db = await _async_client.create_database_if_not_exists(id=COSMOS_DATABASE)
+            for container_name in (TASKS_CONTAINER, COMMENTS_CONTAINER):
+                _async_containers[container_name] = await db.create_container_if_not_exists(
+                    id=container_name,
+                    partition_key=PartitionKey(path=PARTITION_KEY_PATH)
+                )
+        container = _async_containers[name]
+    return container
+
+
+async def get_async_tasks_container() -> "AsyncContainerProxy":
+    return await get_async_container(TASKS_CONTAINER)
+
+
+async def get_async_comments_container() -> "AsyncContainerProxy":
+    return await get_async_container(COMMENTS_CONTAINER)
+
+
+def build_project_query(fields: list, order: str = None, since: bool = False) -> str:
+    """
+    Monta a query de um projeto com projeção só dos campos devolvidos,
+    opcionalmente ordenada por created_at ("asc" ou "desc").
+
+    Com since=True devolve só itens criados ou alterados depois de @since (_ts do Cosmos),
+    ordenados por _ts para o cursor avançar página a página.
+    """
+    projection = ", ".join(f"c.{field}" for field in fields)
+    query = f"SELECT {projection} FROM c WHERE c.project_id = @project_id"
+    if since:
+        query += " AND c._ts > @since ORDER BY c._ts ASC"
+    elif order:
+        query += f" ORDER BY c.created_at {order.upper()}"
+    return query
+
+
+def validate_page_params(limit: str, order: str, since: str = None) -> str:
+    """
+    Valida os parâmetros limit, order e since. Devolve a mensagem de erro ou None.
+    """
+    # isdigit aceita dígitos Unicode (ex.: "²") que int() rejeita; só dígitos ASCII
+    if limit is not None and (not (limit.isascii() and limit.isdecimal()) or not 1 <= int(limit) <= MAX_PAGE_SIZE):
+        return f"Parâmetro limit inválido. Esperado um valor entre 1 e {MAX_PAGE_SIZE}."
+    if order is not None and order.lower() not in ("asc", "desc"):
+        return "Parâmetro order inválido. Esperado 'asc' ou 'desc'."
+    if since is not None and not (since.isascii() and since.isdecimal()):
+        return "Parâmetro since inválido. Esperado o cursor next_since de uma resposta anterior."
+    if since is not None and order is not None:
+        return "Os parâmetros since e order não podem ser usados em conjunto."
+    return None
+
+
+def next_since_cursor(since: int, latest_ts: int) -> int:
+    """
+    Cursor para o próximo pedido incremental.
+
+    O _ts tem resolução de segundos: um item escrito ainda no segundo atual podia ficar
+    de fora de um "_ts > cursor" seguinte, por isso o cursor nunca passa de agora - 1.
+    Os itens desse segundo podem repetir-se no próximo pedido; o cliente junta-os por id.
+    """
+    return max(since or 0, min(latest_ts or 0, int(time.time()) - 1))
+
+
+def encode_continuation(token: str) -> str:
+    if not token:
+        return None
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+
+def decode_continuation(value: str) -> str:
+    """
+    Descodifica o token de continuação opaco devolvido ao cliente.
+    Lança ValueError se o valor for inválido.
+    """
+    try:
+        token = base64.b64decode((value + "=" * (-len(value) % 4)).encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Token de continuação inválido.") from e
+    if not token:
+        raise ValueError("Token de continuação inválido.")
+    return token
+
+
+def request_options() -> dict:
+    """
+    Argumentos extra das chamadas ao Cosmos: com tracing, o response_hook que soma o request charge.
+    """
+    hook = cosmos_response_hook()
+    return {"response_hook": hook} if hook else {}
+
+
+def query_project_items(
+    container: "ContainerProxy",
+    query: str,
+    project_id: str,
+    parameters: list = None,
+    limit: int = None,
+    continuation: str = None
+):
+    """
+    Executa a query na partição do projeto.
+
+    Sem limit nem continuation devolve todos os itens (lidos página a página).
+    Caso contrário lê só uma página de até `limit` itens.
+
+    :return: (itens, função que devolve o token opaco da página seguinte ou None).
+    """
+    parameters = [{"name": "@project_id", "value": project_id}] + (parameters or [])
+    options = request_options()
+
+    if not limit and not continuation:
+        # As páginas seguintes são lidas durante a codificação da resposta
+        items = container.query_items(query=query, parameters=parameters, partition_key=project_id, **options)
+        return items, lambda: None
+
+    pages = container.query_items(
+        query=query,
+        parameters=parameters,
+        partition_key=project_id,
+        max_item_count=limit or MAX_PAGE_SIZE,
+        **options
+    ).by_page(decode_continuation(continuation) if continuation else None)
+
+    with span("cosmos.query"):
+        page = next(pages, [])
+    return page, lambda: encode_continuation(pages.continuation_token)
+
+
+async def async_query_project_items(
+    container: "AsyncContainerProxy",
+    query: str,
+    project_id: str,
+    parameters: list = None,
+    limit: int = None,
+    continuation: str = None
+) -> tuple:
+    """
+    Versão assíncrona de query_project_items.
+
+    :return: (lista de itens, token opaco da página seguinte ou None).
+    """
+    parameters = [{"name": "@project_id", "value": project_id}] + (parameters or [])
+    options = request_options()
+
+    if not limit and not continuation:
+        items = container.query_items(query=query, parameters=parameters, partition_key=project_id, **options)
+        with span("cosmos.query"):
+            return [item async for item in items], None
+
+    pages = container.query_items(
+        query=query,
+        parameters=parameters,
+        partition_key=project_id,
+        max_item_count=limit or MAX_PAGE_SIZE,
+        **options
+    ).by_page(decode_continuation(continuation) if continuation else None)
+
+    with span("cosmos.query"):
+        try:
+            page = [item async for item in await pages.__anext__()]
+        except StopAsyncIteration:
+            page = []
+    return page, encode_continuation(pages.continuation_token)
+
+
+def request_charge(headers) -> float:
+    """
+    Lê o custo em RU de uma resposta do Cosmos.
+    """
+    try:
+        return float((headers or {}).get("x-ms-request-charge", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _create_items_concurrently(container: "ContainerProxy", items: list, charges: list) -> list:
+    from azure.cosmos.exceptions import CosmosHttpResponseError
+
+    def create(index: int, item: dict) -> dict:
+        try:
+            container.create_item(body=item, response_hook=lambda headers, _: charges.append(request_charge(headers)))
+            return {"index": index, "id": item["id"], "success": True, "data": item}
+        except CosmosHttpResponseError as e:
+            charges.append(request_charge(e.headers))
+            return {"index": index, "id": item["id"], "success": False, "status": e.status_code, "error": f"Erro Cosmos ({e.status_code})."}
+
+    max_workers = max(1, min(bulk_max_concurrency, len(items)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(bind(create), range(len(items)), items))
+
+
+def _create_items_in_batches(container: "ContainerProxy", project_id: str, items: list, charges: list) -> list:
+    from azure.cosmos.exceptions import CosmosBatchOperationError
+
+    results = []
+
+    for start in range(0, len(items), BATCH_SIZE):
+        chunk = items[start:start + BATCH_SIZE]
+        operations = [("create", (item,)) for item in chunk]
+
+        try:
+            container.execute_item_batch(
+                batch_operations=operations,
+                partition_key=project_id,
+                response_hook=lambda headers, _: charges.append(request_charge(headers))
+            )
+            results.extend(
+                {"index": start + offset, "id": item["id"], "success": True, "data": item}
+                for offset, item in enumerate(chunk)
+            )
+        except CosmosBatchOperationError as e:
+            # A batch é atómica: falhou toda; só a operação error_index tem o erro real
+            charges.append(request_charge(e.headers))
+            responses = e.operation_responses or []
+            for offset, item in enumerate(chunk):
+                status = responses[offset].get("statusCode") if offset < len(responses) else e.status_code
+                results.append({
+                    "index": start + offset,
+                    "id": item["id"],
+                    "success": False,
+                    "status": status,
+                    "error": f"Erro Cosmos ({status})." if offset == e.error_index else "Batch cancelada por erro noutro item."
+                })
+
+    return results
+
+
+def create_items_bulk(container: "ContainerProxy", project_id: str, items: list, atomic: bool = False) -> tuple:
+    """
+    Cria vários itens de um projeto.
+
+    Com atomic=True usa transactional batches de até BATCH_SIZE itens na partição do projeto
+    (cada batch é tudo-ou-nada). Caso contrário usa create_item em paralelo, limitado a
+    BULK_MAX_CONCURRENCY pedidos em simultâneo.
+
+    :return: (resultado por item, pela ordem recebida; total de RU consumidas).
+    """
+    charges = []
+
+    with span("cosmos.bulk"):
+        if atomic:
+            results = _create_items_in_batches(container, project_id, items, charges)
+        else:
+            results = _create_items_concurrently(container, items, charges)
+
+    add_metric("cosmos.request_charge", sum(charges))
+    return results, round(sum(charges), 2)
+
+
+def warm_up() -> None:
+    """
+    Cria o cliente e provisiona base de dados e containers antes do primeiro pedido.
+    """
+    if not is_configured():
+        logging.warning("Variáveis de ambiente Cosmos DB em falta; warm-up ignorado.")
+        return
+    get_container(TASKS_CONTAINER)
+
+
+def should_reset_clients(error: Exception) -> bool:
+    """
+    Indica se o erro invalida o cliente em cache (credenciais ou ligação).
+    """
+    from azure.cosmos.exceptions import CosmosHttpResponseError
+
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(error, CosmosHttpResponseError):
+        return error.status_code in (401, 403)
+    return False
+
+
+def reset_clients() -> None:
+    """
+    Descarta o cliente e os containers em cache; o próximo pedido volta a criá-los.
+    """
+    global _client
+
+    with _lock:
+        client = _client
+        _client = None
+        _containers.clear()
+
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar CosmosClient: {e}")
+
+
+async def reset_async_clients() -> None:
+    """
+    Descarta o cliente assíncrono e os containers em cache. A sessão aiohttp partilhada mantém-se.
+    """
+    global _async_client, _async_session
+
+    client = _async_client
+    _async_client = None
+    _async_session = None
+    _async_containers.clear()
+
+    if client is not None:
+        try:
+            await client.close()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar CosmosClient assíncrono: {e}")
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import re
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from core.block_upload import MB, block_size_mb, should_upload_in_blocks, upload_stream_in_blocks
+from core.tracing import span
+
+
+# O conteúdo de cada ficheiro fica uma única vez em <prefixo><projeto>/<sha256>
+dedup_content_prefix = os.getenv("DEDUP_CONTENT_PREFIX", "content/sha256/")
+
+# Metadados do blob com o nome do ficheiro, que aponta para o blob de conteúdo
+SHA256_METADATA         = "sha256"
+CONTENT_BLOB_METADATA   = "content_blob"
+CONTENT_LENGTH_METADATA = "content_length"
+
+_sha256_pattern = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_sha256(value) -> bool:
+    return isinstance(value, str) and bool(_sha256_pattern.match(value))
+
+
+def content_blob_name(project_id: str, digest: str) -> str:
+    # O conteúdo é partilhado só dentro do projeto: conhecer o hash não dá acesso a outros projetos
+    return f"{dedup_content_prefix}{project_id}/{digest}"
+
+
+class HashingReader:
+    """
+    Envolve um stream e calcula o SHA-256 dos bytes à medida que são lidos.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.hash.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
+
+
+def stream_digest(stream, chunk_size: int = None) -> str:
+    """
+    Calcula o SHA-256 do stream em blocos de tamanho fixo e volta à posição inicial.
+    """
+    position = stream.tell()
+    reader = HashingReader(stream)
+    while reader.read(chunk_size or block_size_mb * MB):
+        pass
+    stream.seek(position)
+    return reader.hexdigest()
+
+
+def get_content_size(container_client, content_name: str) -> int:
+    """
+    Devolve o tamanho do blob de conteúdo, ou None se ainda não existir.
+    """
+    try:
+        with span("blob.properties"):
+            return container_client.get_blob_client(content_name).get_blob_properties().size
+    except ResourceNotFoundError:
+        return None
+
+
+def upload_content(
+    container_client,
+    content_name: str,
+    stream,
+    digest: str,
+    content_settings=None,
+    block_size: int = None,
+    max_concurrency: int = None
+) -> int:
+    """
+    Envia o stream para o blob de conteúdo, calculando o SHA-256 durante o envio.
+    O blob só é confirmado se o hash coincidir com `digest`. Devolve o tamanho enviado.
+    """
+    reader = HashingReader(stream)
+
+    def verify() -> None:
+        if reader.hexdigest() != digest:
+            raise ValueError("O SHA-256 do ficheiro não coincide com o indicado.")
+
+    blob_client = container_client.get_blob_client(content_name)
+    try:
+        with span("blob.upload"):
+            if should_upload_in_blocks(stream):
+                # Os blocos de um hash errado nunca são confirmados e o serviço descarta-os
+                upload_stream_in_blocks(
+                    blob_client,
+                    reader,
+                    block_size=block_size,
+                    max_concurrency=max_concurrency,
+                    content_settings=content_settings,
+                    overwrite=False,
+                    before_commit=verify
+                )
+            else:
+                data = reader.read()
+                verify()
+                blob_client.upload_blob(data, overwrite=False, content_settings=content_settings)
+    except ResourceExistsError:
+        # Outro pedido enviou o mesmo conteúdo entretanto
+        pass
+
+    return reader.size
+
+
+def link_name(container_client, blob_name: str, project_id: str, digest: str, size: int, content_settings=None) -> None:
+    """
+    Cria (ou substitui) o blob `blob_name` como ponteiro vazio para o conteúdo com `digest`.
+    """
+    metadata = {
+        SHA256_METADATA: digest,
+        CONTENT_BLOB_METADATA: content_blob_name(project_id, digest),
+        CONTENT_LENGTH_METADATA: str(size),
+    }
+    with span("blob.link"):
+        container_client.get_blob_client(blob_name).upload_blob(
+            b"", overwrite=True, content_settings=content_settings, metadata=metadata
+        )
+
+
+def link_existing(container_client, blob_name: str, project_id: str, digest: str, content_settings=None) -> int:
+    """
+    Liga `blob_name` a um conteúdo já guardado, sem enviar bytes.
+    Devolve o tamanho do conteúdo, ou None se ainda não existir.
+    """
+    size = get_content_size(container_client, content_blob_name(project_id, digest))
+    if size is not None:
+        link_name(container_client, blob_name, project_id, digest, size, content_settings)
+    return size
+
+
+def upload_deduplicated(
+    container_client,
+    blob_name: str,
+    project_id: str,
+    stream,
+    digest: str = None,
+    content_settings=None,
+    block_size: int = None,
+    max_concurrency: int = None
+) -> dict:
+    """
+    Guarda o ficheiro pelo SHA-256 do conteúdo e liga-lhe `blob_name`.
+
+    Sem `digest`, o hash é calculado numa leitura do stream antes do envio. Com `digest`
+    indicado pelo cliente, um conteúdo novo é enviado e verificado numa só leitura.
+    Se o conteúdo já existir, os bytes não voltam a ser enviados para o Blob Storage.
+
+    :param block_size: tamanho dos blocos no upload em blocos (por omissão UPLOAD_BLOCK_SIZE_MB).
+    :param max_concurrency: blocos enviados em paralelo (por omissão UPLOAD_BLOCK_CONCURRENCY).
+    :return: {"sha256", "size", "deduplicated"}.
+    """
+    verified = digest is None
+    if verified:
+        with span("dedup.hash"):
+            digest = stream_digest(stream)
+
+    content_name = content_blob_name(project_id, digest)
+    size = get_content_size(container_client, content_name)
+
+    if size is None:
+        size = upload_content(container_client, content_name, stream, digest, content_settings, block_size, max_concurrency)
+        deduplicated = False
+    else:
+        # Os bytes já chegaram no pedido: confirmar o hash custa só CPU e evita ligar o nome ao conteúdo errado
+        if not verified:
+            with span("dedup.hash"):
+                if stream_digest(stream) != digest:
+                    raise ValueError("O SHA-256 do ficheiro não coincide com o indicado.")
+        deduplicated = True
+
+    link_name(container_client, blob_name, project_id, digest, size, content_settings)
+
+    return {"sha256": digest, "size": size, "deduplicated": deduplicated}
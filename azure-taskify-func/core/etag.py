@@ -0,0 +1,55 @@
+import hashlib
+from typing import Callable, Iterable, Iterator
+import azure.functions as func
+
+
+def new_validator(variant: str):
+    """
+    Cria o hash incremental que dá origem ao ETag de uma listagem.
+    A variante (página, ordem, ...) entra no hash para páginas diferentes terem ETags diferentes.
+    """
+    digest = hashlib.sha1()
+    digest.update(variant.encode())
+    return digest
+
+
+def track_items(items: Iterable, digest, validator: Callable[[object], str]) -> Iterator:
+    """
+    Devolve os itens sem os alterar, acrescentando validator(item) ao hash à medida que passam.
+    """
+    count = 0
+    for item in items:
+        digest.update(b"\0" + validator(item).encode())
+        count += 1
+        yield item
+    digest.update(f"\0{count}".encode())
+
+
+def format_etag(digest) -> str:
+    # ETag fraco: o corpo é equivalente, não necessariamente igual byte a byte
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(req: func.HttpRequest, etag: str) -> bool:
+    """
+    Compara o If-None-Match do pedido com o ETag (comparação fraca).
+    """
+    if_none_match = req.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+
+    def opaque(value: str) -> str:
+        return value[2:] if value.startswith("W/") else value
+
+    return opaque(etag) in {opaque(value) for value in candidates}
+
+
+def not_modified_response(etag: str, headers: dict) -> func.HttpResponse:
+    return func.HttpResponse(
+        status_code=304,
+        headers={**headers, "ETag": etag}
+    )
@@ -0,0 +1,47 @@
+import json
+import azure.functions as func
+from core.tracing import span
+
+
+headers = { "Access-Control-Allow-Origin": "*" }
+
+# Codificação compacta, sem espaços nem indentação
+_encode_compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def json_response(status: int, success: bool, message: str, data: dict = None) -> func.HttpResponse:
+    return func.HttpResponse(
+        body=json.dumps({
+            "success": success,
+            "message": message,
+            "data": data or {}
+        }),
+        status_code=status,
+        mimetype="application/json",
+        headers=headers
+    )
+
+
+def read_json_body(req: func.HttpRequest) -> dict:
+    """
+    Devolve o corpo JSON do pedido, ou {} se não for JSON válido.
+    """
+    try:
+        return req.get_json()
+    except ValueError:
+        return {}
+
+
+def compact_json_response(body: dict, headers: dict, status: int = 200) -> func.HttpResponse:
+    """
+    Resposta JSON sem espaços nem indentação, para as listagens com muitos itens.
+    """
+    with span("json.encode"):
+        data = _encode_compact(body)
+
+    return func.HttpResponse(
+        body=data,
+        status_code=status,
+        mimetype="application/json",
+        headers=headers
+    )
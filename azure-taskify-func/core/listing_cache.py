@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from core.tracing import add_metric
+
+
+listing_cache_ttl_seconds = int(os.getenv("LISTING_CACHE_TTL_SECONDS", "30"))
+listing_cache_max_entries = int(os.getenv("LISTING_CACHE_MAX_ENTRIES", "1000"))
+listing_cache_redis_url   = os.getenv("LISTING_CACHE_REDIS_URL")
+
+
+class InProcessBackend:
+    """
+    Cache LRU em memória do worker, com TTL por entrada.
+    """
+
+    def __init__(self, max_entries: int, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                add_metric("listing_cache.evictions", 1)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SharedBackend:
+    """
+    Cache partilhada entre workers e function apps, sobre um cliente com a interface
+    get/set(ex=)/delete do redis-py. O cenário cache de benchmarks/bench_suite.py usa um substituto local.
+    """
+
+    evictions = 0  # o Redis gere as suas próprias evictions
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> bytes:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+
+_backend = None
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _create_backend():
+    if listing_cache_redis_url:
+        try:
+            import redis
+            return SharedBackend(redis.Redis.from_url(listing_cache_redis_url))
+        except ImportError:
+            logging.error("LISTING_CACHE_REDIS_URL definido mas o pacote redis não está instalado; a usar cache local.")
+    return InProcessBackend(listing_cache_max_entries)
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """
+    Substitui o backend da cache (ex.: por um substituto local nos benchmarks).
+    """
+    global _backend
+    _backend = backend
+
+
+def is_enabled() -> bool:
+    return listing_cache_ttl_seconds > 0
+
+
+def _count(name: str) -> None:
+    """
+    Soma ao total do worker (cache_stats) e às métricas do pedido atual, que saem
+    na linha "Trace" do log e nas custom_dimensions.
+    """
+    with _stats_lock:
+        _stats[name] += 1
+    add_metric(f"listing_cache.{name}", 1)
+
+
+def _generation_key(kind: str, project_id: str) -> str:
+    return f"listing:{kind}:{project_id}:generation"
+
+
+def listing_key(kind: str, project_id: str, variant: str) -> str:
+    """
+    Chave da listagem `kind` do projeto na geração atual, ou None se a cache estiver desligada.
+
+    As entradas incluem a geração do projeto: invalidar é só mudar a geração,
+    e as entradas antigas expiram pelo TTL ou pela LRU. A chave é obtida antes da
+    query e reutilizada em set_listing, para que um resultado lido antes de uma
+    escrita fique na geração já invalidada e nunca seja servido.
+    """
+    if not is_enabled():
+        return None
+
+    try:
+        backend = get_backend()
+        generation = backend.get(_generation_key(kind, project_id))
+        if generation is None:
+            generation = uuid.uuid4().hex.encode()
+            backend.set(_generation_key(kind, project_id), generation, listing_cache_ttl_seconds)
+    except Exception as e:
+        logging.warning(f"Erro ao ler a cache de listagens: {e}")
+        return None
+
+    if isinstance(generation, bytes):
+        generation = generation.decode()
+    return f"listing:{kind}:{project_id}:{generation}:{variant}"
+
+
+def get_listing(key: str) -> bytes:
+    """
+    Devolve o corpo em cache da listagem com a chave de listing_key, ou None.
+    """
+    if key is None:
+        return None
+
+    try:
+        body = get_backend().get(key)
+    except Exception as e:
+        logging.warning(f"Erro ao ler a cache de listagens: {e}")
+        return None
+
+    _count("hits" if body is not None else "misses")
+    return body
+
+
+def set_listing(key: str, body: bytes) -> None:
+    if key is None:
+        return
+
+    try:
+        get_backend().set(key, body, listing_cache_ttl_seconds)
+    except Exception as e:
+        logging.warning(f"Erro ao escrever na cache de listagens: {e}")
+
+
+def invalidate_project(kind: str, project_id: str) -> None:
+    """
+    Invalida todas as listagens `kind` do projeto. Chamado depois de cada escrita.
+    """
+    if not is_enabled():
+        return
+
+    try:
+        get_backend().delete(_generation_key(kind, project_id))
+        _count("invalidations")
+    except Exception as e:
+        logging.warning(f"Erro ao invalidar a cache de listagens: {e}")
+
+
+def cache_stats() -> dict:
+    """
+    Totais de hits, misses, invalidações e evictions deste worker.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["evictions"] = get_backend().evictions
+    return stats
@@ -0,0 +1,120 @@
+import json
+from typing import Callable
+import azure.functions as func
+from core.cosmos_clients import build_project_query, is_configured, next_since_cursor, validate_page_params
+from core.etag import etag_matches, format_etag, new_validator, not_modified_response, track_items
+from core.http import compact_json_response, headers, json_response
+from core.listing_cache import get_listing, listing_key, set_listing
+
+
+def cached_listing_response(req: func.HttpRequest, cache_key: str) -> func.HttpResponse:
+    """
+    Devolve a listagem em cache (ou 304), ou None se não estiver em cache.
+    """
+    cached = get_listing(cache_key)
+    if cached is None:
+        return None
+
+    cached_etag, _, cached_body = cached.partition(b"\n")
+    etag = cached_etag.decode()
+    if etag_matches(req, etag):
+        return not_modified_response(etag, headers)
+    return func.HttpResponse(
+        body=cached_body,
+        status_code=200,
+        mimetype="application/json",
+        headers={**headers, "X-Cache": "HIT", "ETag": etag}
+    )
+
+
+def listing_response(
+    req: func.HttpRequest,
+    cache_key: str,
+    cache_variant: str,
+    items,
+    next_continuation,
+    since: str,
+    to_result: Callable[[dict], dict]
+) -> func.HttpResponse:
+    """
+    Codifica a página da listagem, com ETag e cursor next_since, e guarda-a na cache.
+
+    :param cache_key: chave de listing_key, obtida antes da query.
+    :param items: itens lidos do Cosmos (iterável, consumido uma vez).
+    :param next_continuation: função que devolve o token da página seguinte depois de lidos os itens.
+    :param to_result: converte um item do Cosmos no objeto devolvido ao cliente.
+    """
+    digest = new_validator(cache_variant)
+    items = track_items(items, digest, lambda item: f"{item.get('id')}|{item.get('_etag')}")
+
+    if req.headers.get("If-None-Match"):
+        # Valida antes de codificar: se nada mudou, responde 304 sem serializar
+        items = list(items)
+        etag = format_etag(digest)
+        if etag_matches(req, etag):
+            return not_modified_response(etag, headers)
+
+    data = []
+    latest_ts = 0
+    for item in items:
+        latest_ts = max(latest_ts, item.get("_ts") or 0)
+        data.append(to_result(item))
+
+    continuation = next_continuation()
+    # Itens com o mesmo _ts podem estar nas páginas seguintes: o cursor só avança na última página
+    next_since = int(since or 0) if continuation else next_since_cursor(int(since or 0), latest_ts)
+
+    response = compact_json_response(
+        {"success": True, "data": data, "continuation": continuation, "next_since": next_since},
+        {**headers, "X-Cache": "MISS"}
+    )
+    etag = format_etag(digest)
+    response.headers["ETag"] = etag
+    set_listing(cache_key, etag.encode() + b"\n" + response.get_body())
+
+    return response
+
+
+def read_listing_params(req: func.HttpRequest, kind: str, fields: list) -> tuple:
+    """
+    Lê projectId, limit, continuation, order e since do pedido e monta a query com `fields`.
+    A chave da cache da listagem `kind` fica em params["cache_key"].
+    Devolve (parâmetros, resposta de erro ou None).
+    """
+    params = {
+        "project_id": req.route_params.get("projectId"),
+        "limit": req.params.get("limit"),
+        "continuation": req.params.get("continuation"),
+        "order": req.params.get("order"),
+        "since": req.params.get("since"),
+    }
+    if not params["project_id"]:
+        return params, json_response(400, False, "O parâmetro projectId é obrigatório.")
+
+    if not is_configured():
+        return params, json_response(500, False, "Variáveis de ambiente Cosmos DB em falta.")
+
+    page_error = validate_page_params(params["limit"], params["order"], params["since"])
+    if page_error:
+        return params, json_response(400, False, page_error)
+
+    # Listagens em cache por projeto; invalidadas quando há escritas
+    params["cache_variant"] = f"{params['limit']}|{params['continuation']}|{params['order']}|{params['since']}"
+    params["cache_key"] = listing_key(kind, params["project_id"], params["cache_variant"])
+    # _etag e _ts só entram no validador e no cursor da resposta, não no corpo
+    params["query"] = build_project_query(fields + ["_etag", "_ts"], params["order"], since=params["since"] is not None)
+    params["parameters"] = [{"name": "@since", "value": int(params["since"])}] if params["since"] is not None else None
+    return params, None
+
+
+def item_response(req: func.HttpRequest, item: dict, to_result: Callable[[dict], dict]) -> func.HttpResponse:
+    etag = item.get("_etag")
+    if etag and etag_matches(req, etag):
+        return not_modified_response(etag, headers)
+
+    return func.HttpResponse(
+        body=json.dumps({"success": True, "data": to_result(item)}),
+        status_code=200,
+        mimetype="application/json",
+        headers={**headers, "ETag": etag} if etag else headers
+    )
@@ -0,0 +1,48 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable
+
+
+sas_cache_max_entries    = int(os.getenv("SAS_CACHE_MAX_ENTRIES", "10000"))
+sas_cache_margin_minutes = int(os.getenv("SAS_CACHE_MARGIN_MINUTES", "10"))
+
+# (blob_name, permission, lifetime) -> (url, expiry), em ordem LRU
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+def get_cached_sas_url(blob_name: str, permission: str, lifetime: timedelta, build: Callable[[datetime], str]) -> str:
+    """
+    Devolve o URL com SAS em cache para o blob e permissões, ou gera um novo com build(expiry).
+
+    O mesmo URL é reutilizado até faltarem menos de SAS_CACHE_MARGIN_MINUTES para expirar,
+    o que permite aos browsers fazer cache HTTP do conteúdo. A cache guarda no máximo
+    SAS_CACHE_MAX_ENTRIES entradas e descarta as menos usadas.
+    """
+    key = (blob_name, permission, lifetime)
+    now = datetime.utcnow()
+    margin = timedelta(minutes=sas_cache_margin_minutes)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[1] - now > margin:
+            _entries.move_to_end(key)
+            return entry[0]
+
+    expiry = now + lifetime
+    url = build(expiry)
+
+    with _lock:
+        _entries[key] = (url, expiry)
+        _entries.move_to_end(key)
+        while len(_entries) > sas_cache_max_entries:
+            _entries.popitem(last=False)
+
+    return url
+
+
+def clear_sas_cache() -> None:
+    with _lock:
+        _entries.clear()
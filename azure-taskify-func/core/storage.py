@@ -0,0 +1,100 @@
+import os
+from datetime import datetime, timedelta
+from core.dedup import CONTENT_BLOB_METADATA, CONTENT_LENGTH_METADATA
+from core.sas_cache import get_cached_sas_url
+from core.tracing import span
+
+
+# Variáveis de ambiente
+account_name       = os.getenv("STORAGE_ACCOUNT_NAME")
+account_key        = os.getenv("STORAGE_ACCOUNT_KEY")
+container_name     = os.getenv("STORAGE_CONTAINER_NAME")
+account_url        = os.getenv("STORAGE_ACCOUNT_URL")
+connection_string  = os.getenv("AzureWebJobsStorage")
+project_prefix     = os.getenv("FUNCTION_PROJECT_PREFIX")
+
+
+def is_configured(require_prefix: bool = False) -> bool:
+    """
+    Indica se as variáveis de ambiente do Blob Storage estão definidas.
+
+    :param require_prefix: exige também FUNCTION_PROJECT_PREFIX (listagens por projeto).
+    """
+    settings = [account_name, account_key, container_name, account_url, connection_string]
+    if require_prefix:
+        settings.append(project_prefix)
+    return all(settings)
+
+
+# Gerar SAS token para leitura
+def generate_read_sas(blob_name: str, hours: int = 1) -> str:
+    def build(expiry: datetime) -> str:
+        from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+        token = generate_blob_sas(
+            account_name=account_name,
+            container_name=container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=expiry,
+            content_disposition="inline"  # <- Força visualização inline no browser
+        )
+        return f"{account_url}{container_name}/{blob_name}?{token}"
+
+    with span("sas.read"):
+        return get_cached_sas_url(blob_name, "r", timedelta(hours=hours), build)
+
+
+def generate_write_sas(blob_name: str, minutes: int = 15) -> tuple:
+    """
+    Gera um URL só de escrita para o browser enviar o blob diretamente para o Blob Storage.
+    Devolve (url, expiry).
+    """
+    from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+    expiry = datetime.utcnow() + timedelta(minutes=minutes)
+    with span("sas.write"):
+        token = generate_blob_sas(
+            account_name=account_name,
+            container_name=container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(create=True, write=True),
+            expiry=expiry
+        )
+    return f"{account_url}{container_name}/{blob_name}?{token}", expiry
+
+
+def generate_file_sas(blob_name: str, metadata: dict = None, hours: int = 1) -> str:
+    """
+    Como generate_read_sas, mas um ficheiro deduplicado é assinado no blob de conteúdo para que aponta.
+    """
+    return generate_read_sas((metadata or {}).get(CONTENT_BLOB_METADATA) or blob_name, hours)
+
+
+def blob_to_file(blob, project_root: str) -> dict:
+    blob_name = blob.name
+    clean_name = blob_name.replace(f"{project_root}/", "")
+    metadata = blob.metadata or {}
+    return {
+        "id": clean_name,
+        "name": clean_name,
+        "uploadedAt": blob.creation_time.isoformat() if blob.creation_time else None,
+        "lastModified": blob.last_modified.isoformat() if blob.last_modified else None,
+        "size": int(metadata[CONTENT_LENGTH_METADATA]) if CONTENT_LENGTH_METADATA in metadata else blob.size,
+        "url": generate_file_sas(blob_name, metadata),
+    }
+
+
+def is_folder(item) -> bool:
+    # walk_blobs devolve as subpastas como BlobPrefix (sync ou aio), que têm `prefix`; os blobs não
+    return hasattr(item, "prefix")
+
+
+def folder_to_result(folder, project_root: str) -> dict:
+    path = folder.name.replace(f"{project_root}/", "", 1)
+    return {
+        "name": path.rstrip("/").rsplit("/", 1)[-1],
+        "path": path,
+    }
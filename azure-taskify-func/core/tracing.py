@@ -0,0 +1,221 @@
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+
+
+# Com FUNCTIONS_TRACING=true cada pedido regista a duração das suas etapas
+tracing_enabled = os.getenv("FUNCTIONS_TRACING", "false").lower() == "true"
+
+# Trace do pedido atual; None fora de um handler ou com o tracing desligado
+_current = contextvars.ContextVar("request_trace", default=None)
+
+_instruments = None
+_instruments_lock = threading.Lock()
+
+
+class RequestTrace:
+    """
+    Etapas e métricas de um pedido. As etapas com o mesmo nome são somadas.
+    """
+
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.start = time.perf_counter()
+        self.stages = {}   # nome -> [duração total em ms, número de chamadas]
+        self.metrics = {}  # nome -> valor acumulado
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += duration_ms
+            stage[1] += 1
+
+    def add_metric(self, name: str, value: float) -> None:
+        with self._lock:
+            self.metrics[name] = self.metrics.get(name, 0) + value
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: RequestTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add_stage(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str):
+    """
+    Context manager que mede a etapa `name` do pedido atual.
+    Fora de um pedido com tracing devolve um objeto partilhado que não faz nada.
+    """
+    if not tracing_enabled:
+        return _NOOP_SPAN
+    trace = _current.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name)
+
+
+def add_metric(name: str, value: float) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.add_metric(name, value)
+
+
+def cosmos_response_hook():
+    """
+    response_hook para as chamadas ao Cosmos que soma o request charge ao pedido atual.
+    Devolve None sem tracing, para não acrescentar trabalho às chamadas.
+    """
+    trace = _current.get()
+    if trace is None:
+        return None
+
+    def hook(headers, _):
+        try:
+            trace.add_metric("cosmos.request_charge", float((headers or {}).get("x-ms-request-charge", 0)))
+        except (TypeError, ValueError):
+            pass
+
+    return hook
+
+
+def bind(fn):
+    """
+    Liga `fn` ao trace do pedido atual, para ser chamada noutra thread (ex.: ThreadPoolExecutor).
+    """
+    trace = _current.get()
+    if trace is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _current.set(trace)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+def _get_instruments():
+    """
+    Histogramas OpenTelemetry, se o pacote opentelemetry-api estiver instalado.
+    O exporter (ex.: Azure Monitor) é configurado fora da app.
+    """
+    global _instruments
+
+    if _instruments is None:
+        with _instruments_lock:
+            if _instruments is None:
+                try:
+                    from opentelemetry import metrics
+                    meter = metrics.get_meter("python_blob_storage.functions")
+                    _instruments = {
+                        "request": meter.create_histogram("function.request.duration", unit="ms"),
+                        "stage": meter.create_histogram("function.stage.duration", unit="ms"),
+                        "charge": meter.create_histogram("cosmos.request_charge", unit="RU"),
+                    }
+                except ImportError:
+                    _instruments = {}
+    return _instruments
+
+
+def _finish(trace: RequestTrace, response) -> None:
+    total_ms = trace.elapsed_ms()
+    status = getattr(response, "status_code", 500)
+
+    fields = {
+        "function": trace.function_name,
+        "status": status,
+        "duration_ms": round(total_ms, 2),
+        **{f"stage.{name}.ms": round(duration, 2) for name, (duration, _) in trace.stages.items()},
+        **{f"stage.{name}.count": count for name, (_, count) in trace.stages.items() if count > 1},
+        **{name: round(value, 2) for name, value in trace.metrics.items()},
+    }
+    summary = " ".join(f"{key}={value}" for key, value in fields.items() if key != "function")
+    logging.info(f"Trace {trace.function_name}: {summary}", extra={"custom_dimensions": fields})
+
+    instruments = _get_instruments()
+    if instruments:
+        attributes = {"function": trace.function_name, "status": status}
+        instruments["request"].record(total_ms, attributes)
+        for name, (duration, _) in trace.stages.items():
+            instruments["stage"].record(duration, {**attributes, "stage": name})
+        if "cosmos.request_charge" in trace.metrics:
+            instruments["charge"].record(trace.metrics["cosmos.request_charge"], attributes)
+
+    # Server-Timing deixa ver as etapas nas ferramentas de desenvolvimento do browser
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        timings = [f"{name.replace('.', '-')};dur={duration:.1f}" for name, (duration, _) in trace.stages.items()]
+        headers["Server-Timing"] = ", ".join(timings + [f"total;dur={total_ms:.1f}"])
+
+
+def traced(handler):
+    """
+    Decorador dos handlers HTTP, por baixo de @app.route: abre o trace do pedido e,
+    no fim, regista as etapas em log estruturado, métricas OpenTelemetry e Server-Timing.
+    Sem FUNCTIONS_TRACING devolve o handler sem alterações.
+    """
+    if not tracing_enabled:
+        return handler
+
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(req):
+            trace = RequestTrace(handler.__name__)
+            token = _current.set(trace)
+            response = None
+            try:
+                response = await handler(req)
+                return response
+            finally:
+                _current.reset(token)
+                _finish(trace, response)
+
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(req):
+        trace = RequestTrace(handler.__name__)
+        token = _current.set(trace)
+        response = None
+        try:
+            response = handler(req)
+            return response
+        finally:
+            _current.reset(token)
+            _finish(trace, response)
+
+    return wrapper
@@ -0,0 +1,94 @@
+import base64
+import binascii
+import json
+import uuid
+from typing import TYPE_CHECKING
+from azure.core.exceptions import ResourceNotFoundError
+from core.block_upload import make_block_id
+
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobClient
+
+
+# Índice máximo de um chunk; o block id usa 8 dígitos
+MAX_CHUNK_INDEX = 99_999_999
+
+
+def create_session(blob_name: str, content_type: str) -> str:
+    """
+    Cria o identificador opaco de uma sessão de upload.
+
+    O estado da sessão vive no próprio identificador (blob, content type e nonce dos blocos)
+    e na lista de blocos não confirmados do blob, por isso qualquer worker pode continuá-la.
+    """
+    session = {"b": blob_name, "t": content_type, "n": uuid.uuid4().hex[:8]}
+    return base64.urlsafe_b64encode(json.dumps(session).encode()).decode().rstrip("=")
+
+
+def parse_session(session_id: str) -> dict:
+    """
+    Descodifica o identificador da sessão. Devolve None se for inválido.
+    """
+    try:
+        padded = session_id + "=" * (-len(session_id) % 4)
+        session = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(session, dict) or not all(isinstance(session.get(key), str) for key in ("b", "t", "n")):
+        return None
+    return {"blob_name": session["b"], "content_type": session["t"], "nonce": session["n"]}
+
+
+def stage_chunk(blob_client: "BlobClient", session: dict, index: int, data: bytes) -> None:
+    """
+    Envia o chunk `index` como bloco não confirmado. Reenviar um chunk substitui o anterior.
+    """
+    blob_client.stage_block(make_block_id(index, session["nonce"]), data, length=len(data))
+
+
+def get_received_chunks(blob_client: "BlobClient", session: dict) -> dict:
+    """
+    Devolve {índice: tamanho} dos chunks desta sessão já recebidos pelo Blob Storage.
+    """
+    try:
+        _, uncommitted = blob_client.get_block_list("uncommitted")
+    except ResourceNotFoundError:
+        # Ainda nenhum bloco foi enviado
+        return {}
+
+    nonce = session["nonce"]
+    received = {}
+    for block in uncommitted:
+        try:
+            block_name = base64.b64decode(block.id).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            continue
+        if block_name.startswith(nonce) and block_name[len(nonce):].isdigit():
+            received[int(block_name[len(nonce):])] = block.size
+    return received
+
+
+def commit_session(blob_client: "BlobClient", session: dict, chunk_count: int = None) -> list:
+    """
+    Confirma os chunks 0..chunk_count-1 como conteúdo do blob.
+
+    :param chunk_count: número de chunks esperado; por omissão, todos os chunks recebidos.
+    :return: lista com os índices em falta. Se não estiver vazia, nada foi confirmado.
+    """
+    from azure.storage.blob import BlobBlock, ContentSettings
+
+    received = get_received_chunks(blob_client, session)
+
+    if chunk_count is None:
+        chunk_count = max(received) + 1 if received else 0
+
+    missing = [index for index in range(chunk_count) if index not in received]
+    if missing or chunk_count == 0:
+        return missing or [0]
+
+    blob_client.commit_block_list(
+        [BlobBlock(block_id=make_block_id(index, session["nonce"])) for index in range(chunk_count)],
+        content_settings=ContentSettings(content_type=session["content_type"])
+    )
+    return []
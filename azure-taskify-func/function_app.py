@@ -0,0 +1,22 @@
+"""
+Function app única com todas as rotas (documentos, uploads, tarefas, comentários e overview).
+
+As rotas estão em blueprints/ e partilham os módulos de core/. Os SDKs pesados
+(azure.storage.blob e azure.cosmos) só são importados quando uma rota precisa deles,
+por isso o arranque a frio de uma instância paga apenas o azure.functions e as rotas.
+"""
+import azure.functions as func
+from blueprints import comments, documents, overview, tasks, uploads
+from core import blob_clients, cosmos_clients, storage
+
+app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
+
+for blueprint in (uploads.bp, documents.bp, tasks.bp, comments.bp, overview.bp):
+    app.register_functions(blueprint)
+
+
+@app.warm_up_trigger("warmup")
+def warmup(warmup) -> None:
+    # Carrega os SDKs e cria os clientes antes de a instância receber pedidos
+    cosmos_clients.warm_up()
+    blob_clients.warm_up(storage.connection_string, storage.container_name)
@@ -0,0 +1,223 @@
+"""
+Benchmark de carga: pedidos por segundo de uma instância com os handlers síncronos e assíncronos.
+
+Simula o worker de Python das Azure Functions: os handlers síncronos correm num thread pool
+(PYTHON_THREADPOOL_THREAD_COUNT), os assíncronos correm todos no mesmo event loop. Em ambos
+os casos há `--concurrency` clientes a repetir pedidos durante `--duration` segundos.
+
+Usa os emuladores locais por omissão:
+    - blob (get_files_by_project, upload_file): Azurite
+    - tasks (get_project_tasks): Cosmos DB Emulator, com o certificado instalado
+
+Uso:
+    python benchmarks/bench_async_handlers.py --app blob --concurrency 64
+    python benchmarks/bench_async_handlers.py --app tasks --threads 8 --duration 20
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "azure-taskify-func")
+
+# Chaves públicas e bem conhecidas dos emuladores
+AZURITE_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+EMULATOR_KEY = "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw=="
+
+APPS = {
+    "blob": {
+        "module": "blueprints.documents",
+        "env": {
+            "AzureWebJobsStorage": "UseDevelopmentStorage=true",
+            "STORAGE_ACCOUNT_NAME": "devstoreaccount1",
+            "STORAGE_ACCOUNT_KEY": AZURITE_KEY,
+            "STORAGE_ACCOUNT_URL": "http://127.0.0.1:10000/devstoreaccount1/",
+            "STORAGE_CONTAINER_NAME": "bench-async-handlers",
+            "FUNCTION_PROJECT_PREFIX": "bench/",
+        },
+    },
+    "upload": {
+        "module": "blueprints.uploads",
+        "env": {
+            "AzureWebJobsStorage": "UseDevelopmentStorage=true",
+            "STORAGE_ACCOUNT_NAME": "devstoreaccount1",
+            "STORAGE_ACCOUNT_KEY": AZURITE_KEY,
+            "STORAGE_ACCOUNT_URL": "http://127.0.0.1:10000/devstoreaccount1/",
+            "STORAGE_CONTAINER_NAME": "bench-async-handlers",
+            "FUNCTION_PROJECT_PREFIX": "bench/",
+        },
+    },
+    "tasks": {
+        "module": "blueprints.tasks",
+        "env": {
+            "COSMOS_URL": "https://localhost:8081/",
+            "COSMOS_KEY": EMULATOR_KEY,
+            "DATABASE_NAME": "bench-async-handlers",
+            # Sem cache, para cada pedido ir mesmo ao Cosmos
+            "LISTING_CACHE_TTL_SECONDS": "0",
+        },
+    },
+}
+
+PROJECT_ID = "bench-project"
+
+
+def load_app(name: str):
+    """
+    Importa a function app e devolve o módulo do blueprint com os handlers do cenário.
+    """
+    config = APPS[name]
+    for key, value in config["env"].items():
+        os.environ.setdefault(key, value)
+    sys.path.insert(0, APP_DIR)
+
+    import function_app  # regista os blueprints, como no arranque do worker
+    return importlib.import_module(config["module"])
+
+
+def seed(name: str, items: int) -> None:
+    """
+    Cria os dados que os pedidos vão ler.
+    """
+    if name == "blob":
+        from core import storage
+        from core.blob_clients import get_container_client
+        container_client = get_container_client(storage.connection_string, storage.container_name, create=True)
+        for index in range(items):
+            container_client.upload_blob(f"bench/{PROJECT_ID}/file-{index:04d}", b"0", overwrite=True)
+    elif name == "tasks":
+        from core.cosmos_clients import get_tasks_container
+        container = get_tasks_container()
+        for index in range(items):
+            container.upsert_item({
+                "id": f"bench-{index:04d}",
+                "project_id": PROJECT_ID,
+                "description": f"Tarefa {index}",
+                "created_at": "2024-01-01T00:00:00",
+                "status": "ToDo",
+            })
+
+
+def build_request(name: str):
+    import azure.functions as func
+
+    if name == "blob":
+        return func.HttpRequest("GET", "/api/document/project/x/", body=b"", route_params={"project_id": PROJECT_ID})
+    if name == "tasks":
+        return func.HttpRequest("GET", "/api/project/x/task", body=b"", route_params={"projectId": PROJECT_ID})
+
+    from werkzeug.datastructures import FileStorage, MultiDict
+    from werkzeug.test import encode_multipart
+    boundary, body = encode_multipart(MultiDict([
+        ("files", FileStorage(io.BytesIO(b"0" * 1024), filename="bench.txt", content_type="text/plain"))
+    ]))
+    return func.HttpRequest(
+        "POST", "/api/document/project/x/upload/",
+        body=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        route_params={"id": PROJECT_ID}
+    )
+
+
+HANDLERS = {
+    "blob": ("get_files_by_project", "get_files_by_project_async"),
+    "upload": ("upload_file", "upload_file_async"),
+    "tasks": ("get_project_tasks", "get_project_tasks_async"),
+}
+
+
+async def run_load(call, concurrency: int, duration: float) -> tuple:
+    """
+    Corre `concurrency` clientes em ciclo durante `duration` segundos.
+    Devolve (latências em ms, número de erros).
+    """
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(label: str, latencies: list, errors: int, duration: float) -> dict:
+    ordered = sorted(latencies) or [0]
+    result = {
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 2),
+        "errors": errors,
+    }
+    print(f"{label:<6} {result['rps']:8.1f} pedidos/s  p50={result['p50_ms']:8.2f} ms  "
+          f"p95={result['p95_ms']:8.2f} ms  erros={errors}")
+    return result
+
+
+async def main_async(args) -> None:
+    blueprint = load_app(args.app)
+    if not args.no_seed:
+        seed(args.app, args.items)
+
+    sync_name, async_name = HANDLERS[args.app]
+    sync_handler = getattr(blueprint, sync_name)
+    async_handler = getattr(blueprint, async_name)
+
+    # Aquecimento dos dois caminhos (clientes, ligações, provisionamento)
+    sync_handler(build_request(args.app))
+    await async_handler(build_request(args.app))
+
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+
+    async def call_sync():
+        return await loop.run_in_executor(pool, sync_handler, build_request(args.app))
+
+    async def call_async():
+        return await async_handler(build_request(args.app))
+
+    print(f"{args.app}: {args.concurrency} clientes, {args.duration}s, {args.threads} threads no caminho síncrono")
+    results = {
+        "sync": report("sync", *await run_load(call_sync, args.concurrency, args.duration), args.duration),
+        "async": report("async", *await run_load(call_async, args.concurrency, args.duration), args.duration),
+    }
+    pool.shutdown()
+
+    if results["sync"]["rps"]:
+        print(f"Ganho do caminho assíncrono: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"app": args.app, "concurrency": args.concurrency, "threads": args.threads, **results}, output, indent=2)
+
+    from core.async_mode import close_aio_session
+    await close_aio_session()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=sorted(HANDLERS), default="blob")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=min(32, (os.cpu_count() or 1) + 4),
+                        help="threads do caminho síncrono (PYTHON_THREADPOOL_THREAD_COUNT)")
+    parser.add_argument("--items", type=int, default=50, help="blobs ou tarefas criados no projeto")
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--output", help="ficheiro JSON com os resultados")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark do custo por pedido da inicialização do Blob Storage.
+
+Compara o caminho antigo (BlobServiceClient.from_connection_string + exists()
+em cada pedido) com o cliente partilhado de blob_clients. Cada "pedido" faz
+o mesmo trabalho útil: upload de um blob pequeno.
+
+Uso (Azurite por omissão):
+    python benchmarks/bench_blob_clients.py -n 200
+    AzureWebJobsStorage="<connection string>" python benchmarks/bench_blob_clients.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "azure-taskify-func"))
+
+from azure.storage.blob import BlobServiceClient
+from core.blob_clients import get_container_client, reset_clients
+
+
+def cold_request(connection_string: str, container_name: str, blob_name: str) -> None:
+    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+    container_client = blob_service_client.get_container_client(container_name)
+    if not container_client.exists():
+        container_client.create_container()
+    container_client.get_blob_client(blob_name).upload_blob(b"0", overwrite=True)
+
+
+def warm_request(connection_string: str, container_name: str, blob_name: str) -> None:
+    container_client = get_container_client(connection_string, container_name, create=True)
+    container_client.get_blob_client(blob_name).upload_blob(b"0", overwrite=True)
+
+
+def measure(fn, iterations: int, *args) -> list:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<8} média={statistics.mean(ordered):8.2f} ms  "
+          f"p50={statistics.median(ordered):8.2f} ms  p95={p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=100)
+    parser.add_argument("--container", default=os.getenv("STORAGE_CONTAINER_NAME", "bench-blob-clients"))
+    args = parser.parse_args()
+
+    connection_string = os.getenv("AzureWebJobsStorage", "UseDevelopmentStorage=true")
+    blob_name = "bench/blob-clients.txt"
+
+    # Aquecimento: garante que o container existe e que o DNS está em cache
+    cold_request(connection_string, args.container, blob_name)
+    reset_clients()
+
+    cold = measure(cold_request, args.iterations, connection_string, args.container, blob_name)
+    warm = measure(warm_request, args.iterations, connection_string, args.container, blob_name)
+
+    report("antigo", cold)
+    report("warm", warm)
+    saved = statistics.mean(cold) - statistics.mean(warm)
+    print(f"Poupança média por pedido: {saved:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
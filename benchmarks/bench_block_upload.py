@@ -0,0 +1,84 @@
+"""
+Benchmark de throughput e memória: upload_blob com os valores por omissão do SDK
+vs. upload_stream_in_blocks (blocos em paralelo + commit_block_list).
+
+Os dados são gerados em streaming, por isso nem o ficheiro de 1 GB fica em memória
+do lado do benchmark; o pico de memória reportado é o do caminho de upload.
+
+Uso (Azurite por omissão):
+    python benchmarks/bench_block_upload.py
+    python benchmarks/bench_block_upload.py --sizes 10 100 --block-size 4 --concurrency 8
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "azure-taskify-func"))
+
+from core.block_upload import MB, upload_stream_in_blocks
+from core.blob_clients import get_container_client
+
+
+class GeneratedStream(io.RawIOBase):
+    """
+    Stream só de leitura com `size` bytes gerados a pedido.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.position = 0
+        self.pattern = os.urandom(MB)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, n: int = -1) -> bytes:
+        remaining = self.size - self.position
+        if n is None or n < 0 or n > remaining:
+            n = remaining
+        chunk = (self.pattern * (n // MB + 1))[:n]
+        self.position += n
+        return chunk
+
+
+def run(label: str, upload, size: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    upload(GeneratedStream(size))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<8} {size // MB:>6} MB  {elapsed:8.2f} s  "
+          f"{size / MB / elapsed:8.1f} MB/s  pico={peak / MB:8.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1024], help="tamanhos em MB")
+    parser.add_argument("--block-size", type=int, default=8, help="tamanho do bloco em MB")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--container", default=os.getenv("STORAGE_CONTAINER_NAME", "bench-block-upload"))
+    args = parser.parse_args()
+
+    connection_string = os.getenv("AzureWebJobsStorage", "UseDevelopmentStorage=true")
+    container_client = get_container_client(connection_string, args.container, create=True)
+
+    for size_mb in args.sizes:
+        size = size_mb * MB
+        blob_client = container_client.get_blob_client(f"bench/block-upload-{size_mb}mb.bin")
+
+        run("atual", lambda stream: blob_client.upload_blob(stream, length=size, overwrite=True), size)
+        run("blocos", lambda stream: upload_stream_in_blocks(
+            blob_client,
+            stream,
+            block_size=args.block_size * MB,
+            max_concurrency=args.concurrency
+        ), size)
+
+
+if __name__ == "__main__":
+    main()
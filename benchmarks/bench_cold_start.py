@@ -0,0 +1,162 @@
+"""
+Benchmark do arranque a frio: tempo de import de function_app e custo do primeiro pedido.
+
+Cada medição corre num processo novo com `python -X importtime -c "import function_app"`,
+como o worker faz num arranque a frio. Indica o tempo total do import e quanto
+desse tempo é dos SDKs (azure.storage.blob, azure.cosmos). Depois mede o import
+adiado dos SDKs, que na app consolidada só acontece no primeiro pedido.
+
+Com --compare-ref, extrai as apps de um commit anterior (git archive) e mede
+cada azure-*-func da mesma forma.
+
+Uso:
+    python benchmarks/bench_cold_start.py -n 10
+    python benchmarks/bench_cold_start.py --compare-ref HEAD~1 --output cold-start.json
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_DIR = os.path.join(ROOT, "azure-taskify-func")
+
+# Módulos cujo tempo de import cumulativo é reportado à parte
+SDK_MODULES = ["azure.storage.blob", "azure.storage.blob.aio", "azure.cosmos", "azure.cosmos.aio", "aiohttp"]
+
+# Importados pelos handlers no primeiro pedido (clientes e SAS)
+LAZY_MODULES = ["azure.storage.blob", "azure.cosmos"]
+
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    Lê a saída de -X importtime e devolve {módulo: tempo cumulativo em ms}.
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, us_cumulative, name = line[len("import time:"):].split("|")
+        # O mesmo módulo só aparece uma vez por processo; fica o primeiro
+        cumulative.setdefault(name.strip(), int(us_cumulative) / 1000)
+    return cumulative
+
+
+def import_profile(app_dir: str) -> dict:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import function_app"],
+        cwd=app_dir, capture_output=True, text=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"import function_app falhou em {app_dir}:\n{result.stderr[-2000:]}")
+
+    cumulative = parse_importtime(result.stderr)
+    return {
+        "import_ms": cumulative.get("function_app", 0.0),
+        "process_ms": wall,
+        "sdk_ms": {name: cumulative[name] for name in SDK_MODULES if name in cumulative},
+    }
+
+
+def first_request_profile(app_dir: str) -> dict:
+    """
+    Importa function_app e mede à parte o import dos SDKs que o primeiro pedido faz.
+    """
+    script = (
+        "import importlib, json, time\n"
+        "import function_app\n"
+        "timings = {}\n"
+        f"for name in {LAZY_MODULES!r}:\n"
+        "    start = time.perf_counter()\n"
+        "    importlib.import_module(name)\n"
+        "    timings[name] = (time.perf_counter() - start) * 1000\n"
+        "print(json.dumps(timings))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=app_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"primeiro pedido falhou em {app_dir}:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(app_dir: str, iterations: int) -> dict:
+    # Primeira execução só compila os .pyc, como no primeiro arranque depois do deploy
+    import_profile(app_dir)
+
+    runs = [import_profile(app_dir) for _ in range(iterations)]
+    first = [first_request_profile(app_dir) for _ in range(iterations)]
+
+    sdk_names = sorted({name for run in runs for name in run["sdk_ms"]})
+    return {
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "process_ms": statistics.median(run["process_ms"] for run in runs),
+        "sdk_ms": {
+            name: statistics.median(run["sdk_ms"].get(name, 0.0) for run in runs)
+            for name in sdk_names
+        },
+        "first_request_ms": statistics.median(sum(timings.values()) for timings in first),
+    }
+
+
+def extract_apps(ref: str, target: str) -> list:
+    """
+    Extrai as pastas azure-*-func de `ref` para `target`. Devolve os caminhos das apps.
+    """
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], cwd=ROOT, capture_output=True, check=True)
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        members = [member for member in tar.getmembers() if member.name.split("/")[0].startswith("azure-")]
+        tar.extractall(target, members=members)
+
+    return sorted(
+        os.path.join(target, name) for name in os.listdir(target)
+        if os.path.isfile(os.path.join(target, name, "function_app.py"))
+    )
+
+
+def report(label: str, result: dict) -> None:
+    sdk = ", ".join(f"{name}={ms:.0f}" for name, ms in result["sdk_ms"].items()) or "nenhum"
+    print(f"{label:<32} import={result['import_ms']:7.1f} ms  processo={result['process_ms']:7.1f} ms  "
+          f"1.º pedido=+{result['first_request_ms']:6.1f} ms  SDKs no import: {sdk}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    parser.add_argument("--compare-ref", help="commit com as apps antigas (ex.: HEAD~1)")
+    parser.add_argument("--output", help="ficheiro JSON com os resultados")
+    args = parser.parse_args()
+
+    results = {"azure-taskify-func": measure(APP_DIR, args.iterations)}
+    report("azure-taskify-func", results["azure-taskify-func"])
+
+    if args.compare_ref:
+        with tempfile.TemporaryDirectory() as target:
+            old = {}
+            for app_dir in extract_apps(args.compare_ref, target):
+                name = os.path.basename(app_dir)
+                old[name] = measure(app_dir, args.iterations)
+                report(f"{args.compare_ref}:{name}", old[name])
+
+        if old:
+            results[args.compare_ref] = old
+            slowest = max(result["import_ms"] for result in old.values())
+            total = sum(result["import_ms"] for result in old.values())
+            new = results["azure-taskify-func"]["import_ms"]
+            # Antes, cada app arrancava a frio à parte; agora há um só arranque para todas as rotas
+            print(f"Import: app consolidada {new:.1f} ms vs. {slowest:.1f} ms na app antiga mais lenta "
+                  f"({total:.1f} ms somando os {len(old)} arranques a frio).")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
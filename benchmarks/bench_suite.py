@@ -0,0 +1,440 @@
+"""
+Suite de benchmarks offline das function apps, sem conta Azure.
+
+Chama diretamente os handlers func.HttpRequest da function app, com o Blob Storage e o
+Cosmos DB substituídos pelos fakes em memória de benchmarks/fakes.py (com latência
+injetada por chamada) ou, para o lado blob, pelo Azurite.
+
+Cenários:
+    upload    upload_file para cada tamanho de --upload-sizes (MB)
+    listing   get_files_by_project para cada número de blobs de --listing-sizes
+    tasks     get_project_tasks para cada número de tarefas de --task-counts
+    resolve   resolve_project_file_urls para cada número de nomes de --resolve-counts
+    dedup     upload_file_deduplicated de conteúdo já guardado, com o sha256 enviado pelo cliente
+    create    create_project_task
+    cache     get_project_tasks servido da cache partilhada (SharedBackend sobre um Redis falso);
+              antes de medir verifica que uma escrita noutra instância invalida a cache desta
+
+Para cada cenário reporta p50/p95/p99, throughput (pedidos/s, sequencial) e pico de
+memória do handler (tracemalloc, num pedido extra). Os resultados vão para --output em
+JSON; com --baseline compara o p95 com uma execução anterior e termina com código 1
+se algum cenário piorar mais do que --max-regression.
+
+Uso:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --latency-ms 5 --output depois.json --baseline antes.json
+    python benchmarks/bench_suite.py --scenarios upload --blob-backend azurite
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fakes import FakeContainerClient, FakeCosmosContainer, FakeRedis, Latency, install_blob_fake, install_cosmos_fake
+
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "azure-taskify-func")
+MB = 1024 * 1024
+
+CONTAINER_NAME = "bench-suite"
+PROJECT_ID = "bench-project"
+PROJECT_PREFIX = "bench/"
+
+# Módulos da app usados pelos cenários
+APP_MODULES = {
+    "uploads": "blueprints.uploads",
+    "documents": "blueprints.documents",
+    "tasks": "blueprints.tasks",
+    "storage": "core.storage",
+    "blob_clients": "core.blob_clients",
+    "cosmos_clients": "core.cosmos_clients",
+    "listing_cache": "core.listing_cache",
+}
+
+FAKE_ENV = {
+    "AzureWebJobsStorage": "UseDevelopmentStorage=true",
+    "STORAGE_ACCOUNT_NAME": "devstoreaccount1",
+    "STORAGE_ACCOUNT_KEY": "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==",
+    "STORAGE_ACCOUNT_URL": "http://127.0.0.1:10000/devstoreaccount1/",
+    "STORAGE_CONTAINER_NAME": CONTAINER_NAME,
+    "FUNCTION_PROJECT_PREFIX": PROJECT_PREFIX,
+    "COSMOS_URL": "https://localhost:8081/",
+    "COSMOS_KEY": "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+    "DATABASE_NAME": "bench-suite",
+    # Sem cache de listagens: cada pedido vai ao fake
+    "LISTING_CACHE_TTL_SECONDS": "0",
+}
+
+
+def load_app() -> dict:
+    """
+    Importa a function app e devolve os módulos de APP_MODULES por nome.
+    """
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+
+    importlib.import_module("function_app")
+    return {name: importlib.import_module(module) for name, module in APP_MODULES.items()}
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(len(ordered) * fraction)) - 1))]
+
+
+def measure(scenario: str, param, handler, make_request, iterations: int, warmup: int = 2, size: int = None) -> dict:
+    """
+    Corre `iterations` pedidos sequenciais e um pedido extra com tracemalloc para o pico de memória.
+    O pedido é construído fora da medição.
+    """
+    for _ in range(warmup):
+        handler(make_request())
+
+    latencies = []
+    failures = 0
+    for _ in range(iterations):
+        req = make_request()
+        start = time.perf_counter()
+        response = handler(req)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            failures += 1
+
+    req = make_request()
+    tracemalloc.start()
+    handler(req)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    total_seconds = sum(latencies) / 1000
+    result = {
+        "scenario": scenario,
+        "param": param,
+        "iterations": iterations,
+        "failures": failures,
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "throughput_rps": round(iterations / total_seconds, 2) if total_seconds else None,
+        "peak_memory_mb": round(peak / MB, 3),
+    }
+    if size is not None and total_seconds:
+        result["throughput_mb_s"] = round(size * iterations / MB / total_seconds, 2)
+
+    print(f"{scenario:<8} {str(param):>8}  p50={result['p50_ms']:9.2f} ms  p95={result['p95_ms']:9.2f} ms  "
+          f"p99={result['p99_ms']:9.2f} ms  {result['throughput_rps'] or 0:9.1f} pedidos/s  "
+          f"pico={result['peak_memory_mb']:8.2f} MB" + (f"  falhas={failures}" if failures else ""))
+    return result
+
+
+def use_blob_backend(modules: dict, backend: str, latency: Latency) -> FakeContainerClient:
+    if backend == "azurite":
+        return None
+    container = FakeContainerClient(CONTAINER_NAME, latency)
+    install_blob_fake(modules["blob_clients"], CONTAINER_NAME, container)
+    return container
+
+
+def run_upload(args, latency: Latency) -> list:
+    import azure.functions as func
+    from werkzeug.datastructures import FileStorage, MultiDict
+    from werkzeug.test import encode_multipart
+
+    modules = load_app()
+    use_blob_backend(modules, args.blob_backend, latency)
+    handler = modules["uploads"].upload_file
+
+    results = []
+    for size_mb in args.upload_sizes:
+        size = int(size_mb * MB)
+        boundary, body = encode_multipart(MultiDict([
+            ("files", FileStorage(io.BytesIO(os.urandom(size)), filename="bench.pdf", content_type="application/pdf"))
+        ]))
+
+        def make_request():
+            return func.HttpRequest(
+                "POST", f"/api/document/project/{PROJECT_ID}/upload/",
+                body=body,
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                route_params={"id": PROJECT_ID}
+            )
+
+        iterations = max(3, int(args.iterations / max(1.0, size_mb / 8)))
+        results.append(measure("upload", f"{size_mb}MB", handler, make_request, iterations, size=size))
+    return results
+
+
+def run_dedup(args, latency: Latency) -> list:
+    import hashlib
+    import azure.functions as func
+    from werkzeug.datastructures import FileStorage, MultiDict
+    from werkzeug.test import encode_multipart
+
+    modules = load_app()
+    use_blob_backend(modules, args.blob_backend, latency)
+    handler = modules["uploads"].upload_file_deduplicated
+
+    results = []
+    for size_mb in args.upload_sizes:
+        size = int(size_mb * MB)
+        content = os.urandom(size)
+        # O aquecimento do measure guarda o conteúdo; as iterações medidas só criam o ponteiro
+        boundary, body = encode_multipart(MultiDict([
+            ("files", FileStorage(io.BytesIO(content), filename="bench.pdf", content_type="application/pdf")),
+            ("sha256", hashlib.sha256(content).hexdigest())
+        ]))
+
+        def make_request():
+            return func.HttpRequest(
+                "POST", f"/api/document/project/{PROJECT_ID}/upload/dedup/",
+                body=body,
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                route_params={"id": PROJECT_ID}
+            )
+
+        iterations = max(3, int(args.iterations / max(1.0, size_mb / 8)))
+        results.append(measure("dedup", f"{size_mb}MB", handler, make_request, iterations, size=size))
+    return results
+
+
+def run_listing(args, latency: Latency) -> list:
+    import azure.functions as func
+
+    modules = load_app()
+    handler = modules["documents"].get_files_by_project
+
+    results = []
+    for count in args.listing_sizes:
+        container = use_blob_backend(modules, args.blob_backend, latency)
+        prefix = f"{PROJECT_PREFIX}{PROJECT_ID}-{count}/"
+        if container is not None:
+            container.seed(prefix, count)
+        else:
+            seed_azurite(modules, prefix, count)
+
+        def make_request():
+            return func.HttpRequest("GET", "/api/document/project/x/", body=b"", route_params={"project_id": f"{PROJECT_ID}-{count}"})
+
+        results.append(measure("listing", count, handler, make_request, args.iterations))
+    return results
+
+
+def seed_azurite(modules: dict, prefix: str, count: int) -> None:
+    storage = modules["storage"]
+    container_client = modules["blob_clients"].get_container_client(
+        storage.connection_string, storage.container_name, create=True
+    )
+    for index in range(count):
+        container_client.upload_blob(f"{prefix}file-{index:06d}.pdf", b"0" * 1024, overwrite=True)
+
+
+def run_tasks(args, latency: Latency) -> list:
+    import azure.functions as func
+
+    modules = load_app()
+    handler = modules["tasks"].get_project_tasks
+
+    results = []
+    for count in args.task_counts:
+        tasks = FakeCosmosContainer(latency)
+        tasks.seed(f"{PROJECT_ID}-{count}", count)
+        install_cosmos_fake(modules["cosmos_clients"], tasks, FakeCosmosContainer(latency))
+
+        def make_request():
+            return func.HttpRequest("GET", "/api/project/x/task", body=b"", route_params={"projectId": f"{PROJECT_ID}-{count}"})
+
+        results.append(measure("tasks", count, handler, make_request, args.iterations))
+    return results
+
+
+def run_create(args, latency: Latency) -> list:
+    import azure.functions as func
+
+    modules = load_app()
+    install_cosmos_fake(modules["cosmos_clients"], FakeCosmosContainer(latency), FakeCosmosContainer(latency))
+    handler = modules["tasks"].create_project_task
+
+    def make_request():
+        return func.HttpRequest(
+            "POST", "/api/project/x/task",
+            body=json.dumps({"description": "Tarefa de benchmark"}).encode(),
+            route_params={"projectId": PROJECT_ID}
+        )
+
+    return [measure("create", 1, handler, make_request, args.iterations)]
+
+
+def run_cache(args, latency: Latency) -> list:
+    import azure.functions as func
+
+    modules = load_app()
+    listing_cache = modules["listing_cache"]
+    tasks = FakeCosmosContainer(latency)
+    install_cosmos_fake(modules["cosmos_clients"], tasks, FakeCosmosContainer(latency))
+    list_tasks = modules["tasks"].get_project_tasks
+    create_task = modules["tasks"].create_project_task
+
+    # Duas instâncias da function app sobre o mesmo Redis; set_backend troca a instância atual
+    redis = FakeRedis(latency)
+    instance_a = listing_cache.SharedBackend(redis)
+    instance_b = listing_cache.SharedBackend(redis)
+    previous_backend, previous_ttl = listing_cache._backend, listing_cache.listing_cache_ttl_seconds
+    listing_cache.listing_cache_ttl_seconds = 30
+
+    results = []
+    try:
+        for count in args.task_counts:
+            project_id = f"{PROJECT_ID}-cache-{count}"
+            tasks.seed(project_id, count)
+
+            def make_request():
+                return func.HttpRequest("GET", "/api/project/x/task", body=b"", route_params={"projectId": project_id})
+
+            listing_cache.set_backend(instance_a)
+            check_cache(list_tasks, make_request, "MISS", count)
+            check_cache(list_tasks, make_request, "HIT", count)
+
+            listing_cache.set_backend(instance_b)
+            created = create_task(func.HttpRequest(
+                "POST", "/api/project/x/task",
+                body=json.dumps({"description": "Tarefa de benchmark"}).encode(),
+                route_params={"projectId": project_id}
+            ))
+            if created.status_code != 201:
+                raise SystemExit(f"cache: criar a tarefa devolveu {created.status_code}")
+
+            listing_cache.set_backend(instance_a)
+            check_cache(list_tasks, make_request, "MISS", count + 1)
+
+            results.append(measure("cache", count, list_tasks, make_request, args.iterations))
+        print(f"cache    {listing_cache.cache_stats()}")
+    finally:
+        listing_cache.set_backend(previous_backend)
+        listing_cache.listing_cache_ttl_seconds = previous_ttl
+    return results
+
+
+def check_cache(handler, make_request, expected: str, count: int) -> None:
+    """
+    Falha se a listagem não vier da cache como esperado ou não tiver `count` itens.
+    """
+    response = handler(make_request())
+    cache = response.headers.get("X-Cache")
+    items = len(json.loads(response.get_body())["data"])
+    if cache != expected or items != count:
+        raise SystemExit(f"cache: esperado {expected} com {count} tarefas, obtido {cache} com {items}")
+
+
+def run_resolve(args, latency: Latency) -> list:
+    import azure.functions as func
+
+    modules = load_app()
+    container = use_blob_backend(modules, args.blob_backend, latency)
+    handler = modules["documents"].resolve_project_file_urls
+
+    # Pasta com mais blobs do que os pedidos; 1 em cada 10 nomes não existe
+    prefix = f"{PROJECT_PREFIX}{PROJECT_ID}-resolve/"
+    stored = max(args.resolve_counts) * 4
+    if container is not None:
+        container.seed(prefix, stored)
+    else:
+        seed_azurite(modules, prefix, stored)
+
+    results = []
+    for count in args.resolve_counts:
+        names = [f"file-{index * 4 if index % 10 else stored + index:06d}.pdf" for index in range(count)]
+        body = json.dumps({"names": names}).encode()
+
+        def make_request():
+            return func.HttpRequest(
+                "POST", "/api/document/project/x/urls/",
+                body=body,
+                route_params={"project_id": f"{PROJECT_ID}-resolve"}
+            )
+
+        results.append(measure("resolve", count, handler, make_request, args.iterations))
+    return results
+
+
+SCENARIOS = {
+    "upload": run_upload,
+    "listing": run_listing,
+    "tasks": run_tasks,
+    "create": run_create,
+    "resolve": run_resolve,
+    "dedup": run_dedup,
+    "cache": run_cache,
+}
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> list:
+    """
+    Compara o p95 de cada cenário com o baseline. Devolve as regressões acima do limite.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = {(item["scenario"], str(item["param"])): item for item in json.load(baseline_file)["results"]}
+
+    regressions = []
+    print(f"\nComparação com {baseline_path} (p95):")
+    for result in results:
+        previous = baseline.get((result["scenario"], str(result["param"])))
+        if previous is None or not previous["p95_ms"]:
+            continue
+        change = result["p95_ms"] / previous["p95_ms"] - 1
+        flag = "  REGRESSÃO" if change > max_regression else ""
+        print(f"{result['scenario']:<8} {str(result['param']):>8}  {previous['p95_ms']:9.2f} -> {result['p95_ms']:9.2f} ms  {change:+7.1%}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="latência injetada por chamada aos fakes")
+    parser.add_argument("--upload-sizes", type=float, nargs="+", default=[0.1, 1, 8, 48])
+    parser.add_argument("--listing-sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--task-counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--resolve-counts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--blob-backend", choices=["fake", "azurite"], default="fake")
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="resultados JSON de uma execução anterior")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="aumento máximo do p95 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    for key, value in FAKE_ENV.items():
+        os.environ.setdefault(key, value)
+
+    latency = Latency(args.latency_ms)
+    results = []
+    for name in args.scenarios:
+        results.extend(SCENARIOS[name](args, latency))
+
+    with open(args.output, "w") as output:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "latency_ms": args.latency_ms,
+                "blob_backend": args.blob_backend,
+            },
+            "results": results,
+        }, output, indent=2)
+    print(f"\nResultados em {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
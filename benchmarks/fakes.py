@@ -0,0 +1,324 @@
+"""
+Substitutos em memória do Blob Storage, do Cosmos DB e do Redis para os benchmarks offline.
+
+Implementam só a parte da API usada pelas function apps (ContainerClient/BlobClient,
+ContainerProxy e o get/set/delete do redis-py), com uma latência configurável por
+chamada para simular a rede.
+"""
+import base64
+import hashlib
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.paging import ItemPaged
+from azure.cosmos.exceptions import CosmosResourceExistsError, CosmosResourceNotFoundError
+from azure.storage.blob import BlobBlock, BlobPrefix, BlobProperties
+
+
+class Latency:
+    """
+    Atraso injetado em cada chamada a um serviço falso, em milissegundos.
+    """
+
+    def __init__(self, ms: float = 0.0):
+        self.ms = ms
+        self.calls = 0
+
+    def __call__(self) -> None:
+        self.calls += 1
+        if self.ms > 0:
+            time.sleep(self.ms / 1000)
+
+
+def _paged(items: list, page_size: int, latency: Latency) -> ItemPaged:
+    """
+    ItemPaged sobre uma lista, com tokens de continuação numéricos e latência por página.
+    """
+    def get_next(token):
+        latency()
+        start = int(token or 0)
+        return start, items[start:start + page_size]
+
+    def extract_data(response):
+        start, page = response
+        end = start + page_size
+        return (str(end) if end < len(items) else None), iter(page)
+
+    return ItemPaged(get_next, extract_data)
+
+
+class FakeBlobClient:
+    def __init__(self, container: "FakeContainerClient", blob_name: str):
+        self.container = container
+        self.blob_name = blob_name
+        self.url = f"https://fake.blob/{container.container_name}/{blob_name}"
+
+    def upload_blob(self, data, overwrite: bool = False, content_settings=None, metadata=None, **kwargs) -> dict:
+        self.container.latency()
+        content = data if isinstance(data, bytes) else data.read()
+        return self.container._store(self.blob_name, content, content_settings, metadata, overwrite)
+
+    def stage_block(self, block_id: str, data, length: int = None, **kwargs) -> None:
+        self.container.latency()
+        with self.container._lock:
+            self.container._uncommitted.setdefault(self.blob_name, {})[block_id] = bytes(data)
+
+    def get_block_list(self, block_list_type: str = "committed", **kwargs) -> tuple:
+        self.container.latency()
+        with self.container._lock:
+            uncommitted = self.container._uncommitted.get(self.blob_name)
+            if uncommitted is None and self.blob_name not in self.container._blobs:
+                raise ResourceNotFoundError("The specified blob does not exist.")
+            blocks = [BlobBlock(block_id=block_id) for block_id in (uncommitted or {})]
+            for block, data in zip(blocks, (uncommitted or {}).values()):
+                block.size = len(data)
+        return [], blocks
+
+    def commit_block_list(self, block_list: list, content_settings=None, metadata=None, **kwargs) -> dict:
+        self.container.latency()
+        with self.container._lock:
+            staged = self.container._uncommitted.pop(self.blob_name, {})
+        content = b"".join(staged[block.id] for block in block_list)
+        overwrite = kwargs.get("etag") != "*"
+        return self.container._store(self.blob_name, content, content_settings, metadata, overwrite)
+
+    def exists(self, **kwargs) -> bool:
+        self.container.latency()
+        return self.blob_name in self.container._blobs
+
+    def get_blob_properties(self, **kwargs) -> BlobProperties:
+        self.container.latency()
+        entry = self.container._blobs.get(self.blob_name)
+        if entry is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return entry[1]
+
+
+class FakeContainerClient:
+    """
+    ContainerClient em memória. Os blobs ficam em {nome: (conteúdo, BlobProperties)}.
+    """
+
+    def __init__(self, container_name: str, latency: Latency = None, keep_content: bool = False):
+        self.container_name = container_name
+        self.latency = latency or Latency()
+        # Por omissão só o tamanho é guardado, para o pico de memória medir o caminho de upload
+        self.keep_content = keep_content
+        self._lock = threading.Lock()
+        self._blobs = {}
+        self._uncommitted = {}
+        self._created = True
+
+    def exists(self, **kwargs) -> bool:
+        self.latency()
+        return self._created
+
+    def create_container(self, **kwargs) -> None:
+        self.latency()
+        if self._created:
+            raise ResourceExistsError("The specified container already exists.")
+        self._created = True
+
+    def get_blob_client(self, blob: str) -> FakeBlobClient:
+        return FakeBlobClient(self, blob)
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, **kwargs) -> FakeBlobClient:
+        blob_client = self.get_blob_client(name)
+        blob_client.upload_blob(data, overwrite=overwrite, **kwargs)
+        return blob_client
+
+    def list_blobs(self, name_starts_with: str = None, results_per_page: int = None, **kwargs) -> ItemPaged:
+        with self._lock:
+            names = sorted(name for name in self._blobs if name.startswith(name_starts_with or ""))
+            items = [self._blobs[name][1] for name in names]
+        return _paged(items, results_per_page or 5000, self.latency)
+
+    def walk_blobs(self, name_starts_with: str = None, delimiter: str = "/", results_per_page: int = None, **kwargs) -> ItemPaged:
+        """
+        Como list_blobs, mas os blobs abaixo do próximo `delimiter` chegam como um único BlobPrefix.
+        """
+        start = name_starts_with or ""
+        with self._lock:
+            items = {}
+            for name in sorted(self._blobs):
+                if not name.startswith(start):
+                    continue
+                cut = name.find(delimiter, len(start))
+                if cut == -1:
+                    items[name] = self._blobs[name][1]
+                else:
+                    prefix = name[:cut + len(delimiter)]
+                    items.setdefault(prefix, BlobPrefix(None, prefix=prefix, container=self.container_name, delimiter=delimiter))
+        return _paged([items[name] for name in sorted(items)], results_per_page or 5000, self.latency)
+
+    def _store(self, blob_name: str, content: bytes, content_settings, metadata, overwrite: bool) -> dict:
+        now = datetime.now(timezone.utc)
+        properties = BlobProperties()
+        properties.name = blob_name
+        properties.size = len(content)
+        properties.creation_time = now
+        properties.last_modified = now
+        properties.etag = f'"{hashlib.md5(content).hexdigest()}"'
+        properties.metadata = metadata or {}
+        if content_settings is not None:
+            properties.content_settings = content_settings
+
+        with self._lock:
+            if not overwrite and blob_name in self._blobs:
+                raise ResourceExistsError("The specified blob already exists.")
+            self._blobs[blob_name] = (content if self.keep_content else None, properties)
+        return {"etag": properties.etag, "last_modified": now}
+
+    def seed(self, prefix: str, count: int, size: int = 1024) -> None:
+        """
+        Cria `count` blobs de `size` bytes debaixo de `prefix`, sem latência.
+        """
+        latency, self.latency = self.latency, Latency()
+        for index in range(count):
+            self.get_blob_client(f"{prefix}file-{index:06d}.pdf").upload_blob(b"0" * size, overwrite=True)
+        self.latency = latency
+
+
+class FakeCosmosContainer:
+    """
+    ContainerProxy em memória, particionado por project_id.
+
+    Interpreta as queries geradas por build_project_query: projeção, filtro por projeto,
+    @since sobre _ts e ORDER BY.
+    """
+
+    _select = re.compile(r"SELECT (?P<fields>.+?) FROM c", re.IGNORECASE)
+    _order = re.compile(r"ORDER BY c\.(?P<field>\w+) (?P<direction>ASC|DESC)", re.IGNORECASE)
+
+    def __init__(self, latency: Latency = None, request_charge: float = 5.0):
+        self.latency = latency or Latency()
+        self.request_charge = request_charge
+        self._lock = threading.Lock()
+        self._items = {}
+        self._clock = 0
+
+    def _headers(self) -> dict:
+        return {"x-ms-request-charge": str(self.request_charge)}
+
+    def _stamp(self, item: dict) -> dict:
+        with self._lock:
+            self._clock += 1
+            etag = base64.b64encode(str(self._clock).encode()).decode()
+        return {**item, "_ts": int(time.time()), "_etag": f'"{etag}"'}
+
+    def create_item(self, body: dict, response_hook=None, **kwargs) -> dict:
+        self.latency()
+        key = (body["project_id"], body["id"])
+        if key in self._items:
+            raise CosmosResourceExistsError(status_code=409, message="Entity with the specified id already exists.")
+        item = self._stamp(body)
+        self._items[key] = item
+        if response_hook:
+            response_hook(self._headers(), item)
+        return item
+
+    def upsert_item(self, body: dict, **kwargs) -> dict:
+        self.latency()
+        item = self._stamp(body)
+        self._items[(body["project_id"], body["id"])] = item
+        return item
+
+    def read_item(self, item: str, partition_key: str, **kwargs) -> dict:
+        self.latency()
+        found = self._items.get((partition_key, item))
+        if found is None:
+            raise CosmosResourceNotFoundError(status_code=404, message="Entity with the specified id does not exist.")
+        return found
+
+    def execute_item_batch(self, batch_operations: list, partition_key: str, response_hook=None, **kwargs) -> list:
+        self.latency()
+        results = [self.upsert_item(args[0]) for _, args in batch_operations]
+        if response_hook:
+            response_hook({"x-ms-request-charge": str(self.request_charge * len(results))}, results)
+        return results
+
+    def query_items(self, query: str, parameters: list = None, partition_key: str = None, max_item_count: int = None, **kwargs) -> ItemPaged:
+        values = {parameter["name"]: parameter["value"] for parameter in parameters or []}
+        project_id = values.get("@project_id", partition_key)
+
+        items = [item for (pk, _), item in list(self._items.items()) if pk == project_id]
+        if "@since" in values:
+            items = [item for item in items if item["_ts"] > values["@since"]]
+
+        order = self._order.search(query)
+        if order:
+            items.sort(key=lambda item: item.get(order["field"]) or "", reverse=order["direction"].upper() == "DESC")
+
+        select = self._select.search(query)
+        if select and select["fields"].strip() != "*":
+            fields = [field.strip()[2:] for field in select["fields"].split(",")]
+            items = [{field: item.get(field) for field in fields if field in item} for item in items]
+
+        return _paged(items, max_item_count or 100, self.latency)
+
+    def seed(self, project_id: str, count: int, **fields) -> None:
+        """
+        Cria `count` itens no projeto, sem latência.
+        """
+        for index in range(count):
+            item = {
+                "id": f"{project_id}-{index:06d}",
+                "project_id": project_id,
+                "description": f"Item {index}",
+                "created_at": f"2024-01-01T00:00:{index % 60:02d}.{index:06d}",
+                "status": "ToDo",
+                "username": "bench",
+                **fields,
+            }
+            self._items[(project_id, item["id"])] = self._stamp(item)
+
+
+class FakeRedis:
+    """
+    Cliente redis-py em memória (get/set(ex=)/delete), partilhável por vários SharedBackend
+    para simular instâncias da function app sobre o mesmo Redis.
+    """
+
+    def __init__(self, latency: Latency = None):
+        self.latency = latency or Latency()
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def get(self, key: str) -> bytes:
+        self.latency()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[0]
+
+    def set(self, key: str, value, ex: int = None) -> bool:
+        self.latency()
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ex if ex else float("inf"))
+        return True
+
+    def delete(self, key: str) -> int:
+        self.latency()
+        with self._lock:
+            return 1 if self._values.pop(key, None) is not None else 0
+
+
+def install_blob_fake(blob_clients, container_name: str, container: FakeContainerClient) -> None:
+    """
+    Faz blob_clients.get_container_client devolver o container falso.
+    """
+    blob_clients.reset_clients()
+    blob_clients._verified_containers[container_name] = container
+
+
+def install_cosmos_fake(cosmos_clients, tasks: FakeCosmosContainer, comments: FakeCosmosContainer) -> None:
+    """
+    Faz os getters de cosmos_clients devolverem os containers falsos.
+    """
+    cosmos_clients._containers[cosmos_clients.TASKS_CONTAINER] = tasks
+    cosmos_clients._containers[cosmos_clients.COMMENTS_CONTAINER] = comments
@@ -0,0 +1,206 @@
+"""
+Upload em massa de uma pasta local para o container, com vários arquivos em paralelo.
+
+Cada arquivo é enviado com main.upload_document_unique: arquivos pequenos num único
+pedido, arquivos acima de --threshold-mb em blocos paralelos. A estrutura de pastas
+é mantida como prefixo do blob.
+
+Cada upload concluído é acrescentado ao manifesto (JSON Lines, com caminho local,
+tamanho, mtime e nome do blob). Ao repetir o comando com o mesmo manifesto, os
+arquivos que não mudaram desde o upload são ignorados, por isso uma migração
+interrompida pode ser retomada. Arquivos alterados são reenviados com um novo nome
+de blob; o manifesto fica com o nome mais recente.
+
+Com --dedup e --project, os arquivos são guardados como nos uploads com deduplicação
+da function app: o conteúdo fica uma vez em content/sha256/<projeto>/<sha256> e cada
+arquivo é um blob com o nome original que aponta para ele. Conteúdo repetido (na árvore,
+ou já enviado pela app para o mesmo projeto) não é reenviado, e o manifesto guarda
+também o SHA-256 de cada arquivo.
+
+Uso:
+    python bulk_upload.py ./documentos --prefix projects/p1 --workers 8
+    python bulk_upload.py ./documentos --prefix projects/p1 --manifest p1.jsonl
+    python bulk_upload.py ./documentos --prefix projects/p1 --dedup --project p1
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+MB = 1024 * 1024
+
+
+def walk_files(root: str, include_hidden: bool = False) -> list:
+    """
+    Devolve os caminhos relativos (com "/") de todos os arquivos debaixo de `root`, por ordem.
+    """
+    files = []
+    for folder, dirs, names in os.walk(root):
+        if not include_hidden:
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            names = [name for name in names if not name.startswith(".")]
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(folder, name)
+            files.append(os.path.relpath(path, root).replace(os.sep, "/"))
+    return files
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Lê o manifesto e devolve {caminho relativo: entrada}. Linhas incompletas são ignoradas.
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+
+    with open(path, encoding="utf-8") as manifest:
+        for line in manifest:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Última linha cortada por uma interrupção a meio da escrita
+                continue
+            entries[entry["path"]] = entry
+    return entries
+
+
+def is_uploaded(entry: dict, size: int, mtime: float) -> bool:
+    return entry is not None and entry.get("size") == size and entry.get("mtime") == mtime
+
+
+class Progress:
+    """
+    Contagem de arquivos e bytes enviados, partilhada pelas threads de upload.
+    """
+
+    def __init__(self, total_files: int, total_bytes: int):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files = 0
+        self.bytes = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, path: str, size: int, blob_name: str) -> None:
+        with self._lock:
+            self.files += 1
+            if blob_name:
+                self.bytes += size
+            else:
+                self.failed += 1
+            elapsed = time.perf_counter() - self.start
+            rate = self.bytes / MB / elapsed if elapsed else 0.0
+            percent = self.bytes * 100 / self.total_bytes if self.total_bytes else 100.0
+            status = "✔" if blob_name else "❌"
+            print(f"[{self.files}/{self.total_files}] {percent:5.1f}%  {rate:7.2f} MB/s  {status} {path}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="pasta local a enviar")
+    parser.add_argument("--prefix", default="", help="prefixo dos blobs no container (ex.: projects/p1)")
+    parser.add_argument("--manifest", help="manifesto JSON Lines (por omissão: <pasta>.manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=4, help="arquivos enviados em paralelo")
+    parser.add_argument("--block-concurrency", type=int, default=4, help="blocos em paralelo por arquivo grande")
+    parser.add_argument("--block-size-mb", type=int, default=8)
+    parser.add_argument("--threshold-mb", type=int, default=32, help="a partir deste tamanho o upload é feito em blocos")
+    parser.add_argument("--dedup", action="store_true", help="não reenvia conteúdo que o projeto já tenha (requer --project)")
+    parser.add_argument("--project", help="id do projeto na app, dono do conteúdo deduplicado")
+    parser.add_argument("--include-hidden", action="store_true", help="inclui arquivos e pastas começados por '.'")
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.directory)
+    if not os.path.isdir(root):
+        parser.error(f"'{args.directory}' não é uma pasta.")
+    if args.dedup and not args.project:
+        parser.error("--dedup precisa de --project.")
+
+    manifest_path = args.manifest or f"{root.rstrip(os.sep)}.manifest.jsonl"
+    uploaded = load_manifest(manifest_path)
+
+    pending = []
+    skipped = 0
+    for path in walk_files(root, args.include_hidden):
+        stat = os.stat(os.path.join(root, path))
+        if is_uploaded(uploaded.get(path), stat.st_size, stat.st_mtime):
+            skipped += 1
+        else:
+            pending.append((path, stat.st_size, stat.st_mtime))
+
+    print(f"{len(pending)} arquivos a enviar ({sum(item[1] for item in pending) / MB:.1f} MB); "
+          f"{skipped} já constam do manifesto '{manifest_path}'.")
+    if not pending:
+        return
+
+    # Só importa aqui: main.py obtém as chaves da conta e cria o cliente ao ser importado
+    import main as blob_storage
+    # main.py envia em blocos com core.block_upload, o mesmo módulo da app
+    blob_storage.block_upload.block_threshold_mb = args.threshold_mb
+    blob_storage.get_or_create_container()
+
+    progress = Progress(len(pending), sum(item[1] for item in pending))
+    manifest_lock = threading.Lock()
+
+    def upload(path: str, size: int, mtime: float) -> str:
+        prefix = "/".join(part for part in (args.prefix.strip("/"), os.path.dirname(path)) if part)
+        sha256 = None
+        if args.dedup:
+            result = blob_storage.upload_document_deduplicated(
+                os.path.join(root, path),
+                args.project,
+                prefix=prefix or None,
+                block_size=args.block_size_mb * MB,
+                max_concurrency=args.block_concurrency,
+                verbose=False
+            )
+            blob_name, sha256 = (result["blob_name"], result["sha256"]) if result else (None, None)
+        else:
+            blob_name = blob_storage.upload_document_unique(
+                os.path.join(root, path),
+                prefix=prefix or None,
+                block_size=args.block_size_mb * MB,
+                max_concurrency=args.block_concurrency,
+                verbose=False
+            )
+        if blob_name:
+            entry = {
+                "path": path,
+                "size": size,
+                "mtime": mtime,
+                "blob_name": blob_name,
+                "sha256": sha256,
+                "uploaded_at": datetime.now(timezone.utc).isoformat()
+            }
+            # Uma linha por upload, gravada logo: uma interrupção não perde os anteriores
+            with manifest_lock, open(manifest_path, "a", encoding="utf-8") as manifest:
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        progress.update(path, size, blob_name)
+        return blob_name
+
+    executor = ThreadPoolExecutor(max_workers=max(1, args.workers))
+    try:
+        futures = [executor.submit(upload, *item) for item in pending]
+        for future in as_completed(futures):
+            future.result()
+    except KeyboardInterrupt:
+        print("Interrompido; os uploads concluídos ficam no manifesto.")
+        executor.shutdown(wait=True, cancel_futures=True)
+        sys.exit(130)
+    executor.shutdown()
+
+    elapsed = time.perf_counter() - progress.start
+    print(f"Concluído: {progress.files - progress.failed}/{progress.files} arquivos, "
+          f"{progress.bytes / MB:.1f} MB em {elapsed:.1f} s ({progress.bytes / MB / elapsed if elapsed else 0:.2f} MB/s).")
+    if progress.failed:
+        print(f"❌ {progress.failed} arquivos falharam; volte a correr o comando para os reenviar.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Exporta os blobs do container com URLs SAS de leitura para CSV ou JSON Lines.
+
+A listagem é lida página a página (list_blobs com tokens de continuação) e cada linha
+(nome, tamanho, last_modified, URL SAS) é escrita logo no arquivo, sem guardar a
+listagem em memória. Cada --prefix vai para o seu arquivo e os prefixos são
+exportados em paralelo (--workers); prefixos sobrepostos repetem blobs.
+
+Depois de cada página o estado (token de continuação e posição no arquivo) é gravado
+em <output-dir>/export-state.json. Ao repetir o comando com a mesma pasta, cada
+prefixo continua na página seguinte à última gravada; o que tiver sido escrito depois
+disso é descartado e volta a ser exportado. Use --restart para começar do zero.
+
+Uso:
+    python export_sas.py --output-dir export
+    python export_sas.py --prefix projects/p1/ projects/p2/ --format jsonl --workers 4 --hours 24
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+FIELDS = ["name", "size", "last_modified", "url"]
+STATE_FILE = "export-state.json"
+
+
+class ExportState:
+    """
+    Estado da exportação por prefixo, gravado de forma atómica depois de cada página.
+    """
+
+    def __init__(self, path: str, restart: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.prefixes = {}
+        if not restart and os.path.exists(path):
+            with open(path, encoding="utf-8") as state:
+                self.prefixes = json.load(state)
+
+    def get(self, prefix: str) -> dict:
+        with self._lock:
+            return dict(self.prefixes.get(prefix) or {"continuation": None, "offset": 0, "rows": 0, "done": False})
+
+    def save(self, prefix: str, entry: dict) -> None:
+        with self._lock:
+            self.prefixes[prefix] = dict(entry)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as state:
+                json.dump(self.prefixes, state, indent=2)
+            os.replace(temp_path, self.path)
+
+
+def output_path(output_dir: str, prefix: str, fmt: str) -> str:
+    name = prefix.strip("/").replace("/", "_") or "_container"
+    return os.path.join(output_dir, f"{name}.{fmt}")
+
+
+def export_prefix(container_client, prefix: str, path: str, fmt: str, state: ExportState,
+                  sign, page_size: int, on_page=None) -> dict:
+    """
+    Exporta os blobs de `prefix` para `path`, retomando do estado gravado.
+    """
+    entry = state.get(prefix)
+    if entry["done"]:
+        return entry
+
+    with open(path, "r+b" if os.path.exists(path) else "wb") as raw:
+        # Descarta linhas escritas depois da última página gravada no estado
+        raw.truncate(entry["offset"])
+        raw.seek(entry["offset"])
+        out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+        writer = csv.writer(out) if fmt == "csv" else None
+        if writer is not None and entry["offset"] == 0:
+            writer.writerow(FIELDS)
+
+        pages = container_client.list_blobs(
+            name_starts_with=prefix or None,
+            results_per_page=page_size
+        ).by_page(continuation_token=entry["continuation"])
+
+        for page in pages:
+            rows = 0
+            for blob in page:
+                row = [
+                    blob.name,
+                    blob.size,
+                    blob.last_modified.isoformat() if blob.last_modified else None,
+                    sign(blob.name)
+                ]
+                if writer is not None:
+                    writer.writerow(row)
+                else:
+                    out.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
+                rows += 1
+
+            out.flush()
+            # A última página fica marcada como concluída no mesmo checkpoint: sem token, um
+            # estado por concluir faria a nova execução recomeçar a listagem e repetir linhas
+            entry.update(
+                continuation=pages.continuation_token,
+                offset=raw.tell(),
+                rows=entry["rows"] + rows,
+                done=pages.continuation_token is None
+            )
+            state.save(prefix, entry)
+            if on_page:
+                on_page(prefix, rows)
+
+        if not entry["done"]:
+            # Listagem sem nenhuma página
+            entry["done"] = True
+            state.save(prefix, entry)
+        out.detach()
+
+    return entry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prefix", nargs="+", default=[""], help="prefixos a exportar (por omissão, o container inteiro)")
+    parser.add_argument("--output-dir", default="sas-export")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--workers", type=int, default=4, help="prefixos exportados em paralelo")
+    parser.add_argument("--page-size", type=int, default=5000, help="resultados por página do list_blobs")
+    parser.add_argument("--hours", type=int, default=1, help="validade dos URLs SAS")
+    parser.add_argument("--restart", action="store_true", help="ignora o estado gravado e começa do zero")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state = ExportState(os.path.join(args.output_dir, STATE_FILE), args.restart)
+
+    # Só importa aqui: main.py obtém as chaves da conta e cria o cliente ao ser importado
+    import main as blob_storage
+    container_client = blob_storage.get_or_create_container()
+
+    lock = threading.Lock()
+    totals = {"rows": 0}
+    start = time.perf_counter()
+
+    def on_page(prefix: str, rows: int) -> None:
+        with lock:
+            totals["rows"] += rows
+            elapsed = time.perf_counter() - start
+            print(f"{prefix or '(container)'}: +{rows} blobs  total={totals['rows']}  "
+                  f"{totals['rows'] / elapsed if elapsed else 0:.0f} blobs/s", flush=True)
+
+    def export(prefix: str) -> dict:
+        return export_prefix(
+            container_client,
+            prefix,
+            output_path(args.output_dir, prefix, args.format),
+            args.format,
+            state,
+            lambda name: blob_storage.generate_read_sas(name, args.hours),
+            args.page_size,
+            on_page
+        )
+
+    prefixes = list(dict.fromkeys(args.prefix))
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(prefixes)))) as executor:
+        futures = {prefix: executor.submit(export, prefix) for prefix in prefixes}
+
+    failed = 0
+    for prefix, future in futures.items():
+        try:
+            entry = future.result()
+            print(f"✔ {prefix or '(container)'}: {entry['rows']} blobs em {output_path(args.output_dir, prefix, args.format)}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ Erro ao exportar '{prefix}': {e}. Volte a correr o comando para continuar.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
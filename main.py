@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
 
@@ -7,11 +7,23 @@ from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPerm
 from azure.core.exceptions import ResourceNotFoundError
 
 import os
+import threading
 import uuid
 from azure.core.exceptions import ResourceExistsError
 
 import json
+import mimetypes
 import subprocess
+import sys
+from azure.storage.blob import ContentSettings
+
+# Upload em blocos, cache de SAS, resolução de URLs e deduplicação são os mesmos da
+# function app: os módulos core são importados de lá em vez de copiados
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "azure-taskify-func"))
+from core import block_upload
+from core.blob_resolver import resolve_blob_urls
+from core.dedup import upload_deduplicated
+from core.sas_cache import get_cached_sas_url
 
 def get_storage_account_keys(resource_group, storage_account_name):
     cmd = [
@@ -46,22 +58,41 @@ def create_container():
 
 
 def generate_read_sas(blob_name: str, hours: int = 1) -> str:
-    token = generate_blob_sas(
-        account_name=storage_account_name,
-        container_name=container_name,
-        blob_name=blob_name,
-        account_key=account_key,
-        permission=BlobSasPermissions(read=True),
-        expiry=datetime.utcnow() + timedelta(hours=hours)
-    )
-    return f"{account_url}/{container_name}/{blob_name}?{token}"
+    def build(expiry: datetime) -> str:
+        token = generate_blob_sas(
+            account_name=storage_account_name,
+            container_name=container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=expiry
+        )
+        return f"{account_url}/{container_name}/{blob_name}?{token}"
+
+    return get_cached_sas_url(blob_name, "r", timedelta(hours=hours), build)
+
+
+_container_client = None
+_container_lock = threading.Lock()
 
 
 def get_or_create_container():
-    client = blob_service_client.get_container_client(container_name)
-    if not client.exists():
-        client = create_container()
-    return client
+    """
+    Devolve o ContainerClient, verificando/criando o container só na primeira chamada.
+    """
+    global _container_client
+
+    with _container_lock:
+        if _container_client is None:
+            client = blob_service_client.get_container_client(container_name)
+            if not client.exists():
+                try:
+                    client = create_container()
+                except ResourceExistsError:
+                    # Criado por outro processo entretanto
+                    pass
+            _container_client = client
+        return _container_client
 
 
 def blob_exists(blob_name: str) -> bool:
@@ -76,59 +107,129 @@ def blob_exists(blob_name: str) -> bool:
 
 
 def list_images_with_sas():
+    """
+    Imprime o URL SAS de cada blob. Para exportar containers grandes, usar export_sas.py.
+    """
     container_client = get_or_create_container()
     
     print("Listing images and their SAS URLs: \n")
     
     for blob in container_client.list_blobs():
-        sas_token = generate_read_sas(blob.name, 1)
-
-        blob_url = f"{account_url}/{container_name}/{blob.name}?{sas_token}"
+        # generate_read_sas já devolve o URL completo
+        blob_url = generate_read_sas(blob.name, 1)
 
         # print(f"Image: {blob.name}")
         print(f"SAS URL: {blob_url}\n")
 
 
-def get_blob_url(blob_name: str) -> str:
+def get_single_blob_url(blob_name: str) -> str:
     """
     Retorna a URL completa do blob, incluindo o SAS token.
+    Para vários blobs, usar get_blob_url, que resolve todos de uma vez.
     """
     _ = get_or_create_container()
     
     if not blob_exists(blob_name):
         raise ResourceNotFoundError(f"Blob '{blob_name}' não encontrado no container '{container_name}'.")
     
-    sas_token = generate_read_sas(blob_name, 1)
-    return f"{account_url}/{container_name}/{blob_name}?{sas_token}"
+    # generate_read_sas já devolve a URL completa com o SAS
+    return generate_read_sas(blob_name, 1)
 
 
-def get_blob_url(blob_names: List[str]) -> Dict[str, str]:
+def get_blob_url(blob_names: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Retorna {nome: URL com SAS, ou None se o blob não existir} para todos os nomes.
+
+    A existência é verificada em lote: pastas com muitos nomes pedidos são listadas
+    (walk_blobs) e os restantes nomes verificados com HEADs em paralelo.
+    """
     container_client = get_or_create_container()
-    sas_urls: Dict[str, str] = {}
+    return resolve_blob_urls(container_client, blob_names, lambda name, metadata: generate_read_sas(name, 1))
 
-    for name in blob_names:
-        blob_client = container_client.get_blob_client(name)
-        
-        # opcional: checar existência
-        if not blob_client.exists():
-            sas_urls[name] = None
-            continue
 
-        sas_token = generate_read_sas(name, 1)
-        sas_urls[name] = sas_token
-    
-    return sas_urls
+def upload_document_deduplicated(
+    file_path: str,
+    project_id: str,
+    prefix: str = None,
+    block_size: int = None,
+    max_concurrency: int = None,
+    verbose: bool = True
+) -> Optional[dict]:
+    """
+    Faz upload de um arquivo com deduplicação por conteúdo, no mesmo formato da function app
+    (core/dedup.py): o conteúdo fica uma única vez em content/sha256/<projeto>/<sha256> e o
+    blob com o nome original do arquivo é um ponteiro vazio para ele. Conteúdo já enviado
+    pela app ou por outro upload do mesmo projeto não é reenviado.
 
+    Arquivos acima de UPLOAD_BLOCK_THRESHOLD_MB (core.block_upload) são enviados em blocos.
 
-def upload_document_unique(file_path: str, prefix: str = None, overwrite: bool = False) -> str:
+    :param file_path: caminho completo para o arquivo local.
+    :param project_id: projeto dono do conteúdo; tem de ser o mesmo id usado na app.
+    :param prefix: pasta do blob com o nome do arquivo (ex: "projects/p1/docs").
+    :return: {"blob_name", "sha256", "size", "deduplicated"}, ou None se o upload falhar.
+    """
+    blob_name = os.path.basename(file_path)
+    if prefix:
+        blob_name = f"{prefix.rstrip('/')}/{blob_name}"
+
+    content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    container_client = get_or_create_container()
+
+    with open(file_path, "rb") as data:
+        try:
+            result = upload_deduplicated(
+                container_client,
+                blob_name,
+                project_id,
+                data,
+                content_settings=ContentSettings(content_type=content_type),
+                block_size=block_size,
+                max_concurrency=max_concurrency
+            )
+        except Exception as e:
+            print(f"❌ Erro ao fazer upload de '{file_path}': {e}")
+            return None
+
+    if verbose:
+        origin = "conteúdo já existente" if result["deduplicated"] else "conteúdo novo"
+        print(f"✔ '{blob_name}' ligado a {result['sha256']} ({origin})")
+    return {"blob_name": blob_name, **result}
+
+
+def upload_document_unique(
+    file_path: str,
+    prefix: str = None,
+    overwrite: bool = False,
+    block_size: int = None,
+    max_concurrency: int = None,
+    verbose: bool = True,
+    dedup: bool = False,
+    project_id: str = None
+) -> str:
     """
     Faz upload de um arquivo local para o container, gerando um nome de blob único.
+    Arquivos acima de UPLOAD_BLOCK_THRESHOLD_MB são enviados em blocos paralelos
+    (core.block_upload, o mesmo upload em blocos da function app).
+
+    Com dedup=True o arquivo é enviado com upload_document_deduplicated: o blob fica
+    com o nome original e aponta para o conteúdo partilhado do projeto `project_id`.
     
     :param file_path: caminho completo para o arquivo local.
     :param prefix: prefixo opcional (ex: "docs/" ou "images/") para organizar dentro do container.
     :param overwrite: se True, sobrescreve o blob existente; se False, gera erro se já existir.
+    :param block_size: tamanho de cada bloco no upload em blocos (por omissão UPLOAD_BLOCK_SIZE_MB).
+    :param max_concurrency: número de blocos enviados em paralelo (por omissão UPLOAD_BLOCK_CONCURRENCY).
+    :param verbose: se False, só os erros são impressos.
+    :param dedup: se True, não reenvia conteúdo que o projeto já tenha.
+    :param project_id: projeto do conteúdo deduplicado; obrigatório com dedup=True.
     :return: o nome do blob criado.
     """
+    if dedup:
+        if not project_id:
+            raise ValueError("dedup=True precisa de project_id.")
+        result = upload_document_deduplicated(file_path, project_id, prefix, block_size, max_concurrency, verbose)
+        return result["blob_name"] if result else None
+
     # Extrai extensão do arquivo, ex: ".pdf", ".png"
     _, ext = os.path.splitext(file_path)
     
@@ -140,14 +241,26 @@ def upload_document_unique(file_path: str, prefix: str = None, overwrite: bool =
         prefix = prefix.rstrip("/") + "/"
         blob_name = f"{prefix}{blob_name}"
 
+    content_settings = ContentSettings(content_type=mimetypes.guess_type(file_path)[0] or "application/octet-stream")
     container_client = get_or_create_container()
 
     blob_client = container_client.get_blob_client(blob_name)
 
     with open(file_path, "rb") as data:
         try:
-            blob_client.upload_blob(data, overwrite=overwrite)
-            print(f"✔ Upload concluído como '{blob_name}'")
+            if block_upload.should_upload_in_blocks(data):
+                block_upload.upload_stream_in_blocks(
+                    blob_client,
+                    data,
+                    block_size=block_size,
+                    max_concurrency=max_concurrency,
+                    content_settings=content_settings,
+                    overwrite=overwrite
+                )
+            else:
+                blob_client.upload_blob(data, overwrite=overwrite, content_settings=content_settings)
+            if verbose:
+                print(f"✔ Upload concluído como '{blob_name}'")
             return blob_name
         except ResourceExistsError:
             print(f"❌ Blob '{blob_name}' já existe. Tente novamente ou habilite overwrite=True.")